@@ -0,0 +1,13 @@
+## -- Importing External Modules -- ##
+from fastapi import Request
+
+## -- Importing Internal Modules -- ##
+from app.services.pokedex import Pokedex
+from app.services.name_index import NameIndex
+
+
+def get_pokedex(request: Request) -> Pokedex:
+    return request.app.state.pokedex
+
+def get_names(request: Request) -> NameIndex:
+    return request.app.state.names
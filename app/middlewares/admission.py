@@ -0,0 +1,181 @@
+## -- Importing External Modules -- ##
+from fastapi.responses import JSONResponse
+from collections import deque
+import asyncio
+
+## -- Importing Internal Modules -- ##
+from app.services import metrics, timing
+from app.settings import env_int, env_float
+
+# Paths never held back, so the api can still be watched while overloaded
+EXEMPT_PATHS = ("/status", "/metrics")
+
+
+class AdmissionController:
+    """
+    Cap of the requests being handled at the same time ("max_in_flight"),
+    with a bounded FIFO queue ("max_queue") of requests waiting up to
+    "queue_timeout" seconds for their turn. Requests that do not fit are
+    shed right away instead of piling up on the event loop.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 256,
+        max_queue: int = 512,
+        queue_timeout: float = 2.0,
+        retry_after: int = 1,
+    ):
+
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self.in_flight = 0
+        self.waiters = deque()
+
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        self.timed_out = 0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+
+        return cls(
+            max_in_flight = env_int("TD_MAX_IN_FLIGHT", 256),
+            max_queue = env_int("TD_MAX_QUEUE", 512),
+            queue_timeout = env_float("TD_QUEUE_TIMEOUT", 2.0),
+            retry_after = env_int("TD_RETRY_AFTER", 1),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_in_flight > 0
+
+    async def acquire(self) -> bool:
+        """
+        Wait for a slot, returning False if the request should be shed
+        """
+
+        if self.in_flight < self.max_in_flight and not self.waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+        if len(self.waiters) >= self.max_queue:
+            self.shed += 1
+            metrics.ADMISSION_SHED.labels("queue_full").inc()
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.queued += 1
+
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+
+        except asyncio.TimeoutError:
+            self._forget(waiter)
+            self.timed_out += 1
+            self.shed += 1
+            metrics.ADMISSION_SHED.labels("timed_out").inc()
+            return False
+
+        except asyncio.CancelledError:
+
+            # The slot was handed over right before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+
+            else:
+                self._forget(waiter)
+
+            raise
+
+        self.admitted += 1
+        return True
+
+    def _forget(self, waiter: asyncio.Future):
+
+        try:
+            self.waiters.remove(waiter)
+
+        except ValueError:
+            pass
+
+    def release(self):
+        """
+        Hand the slot over to the next waiter, or free it
+        """
+
+        while self.waiters:
+
+            waiter = self.waiters.popleft()
+
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": len(self.waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying the AdmissionController to the http requests,
+    answering the shed ones with 503 and Retry-After. The slot is held until
+    the response is fully sent (streamed ones included).
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+
+        if (
+            scope["type"] != "http"
+            or not self.controller.enabled
+            or scope["path"].startswith(EXEMPT_PATHS)
+        ):
+            timing.checkpoint()
+            return await self.app(scope, receive, send)
+
+        with timing.phase("queue"):
+            admitted = await self.controller.acquire()
+
+        if not admitted:
+
+            response = JSONResponse(
+                status_code = 503,
+                content = {
+                    "status": "error",
+                    "message": "Server is overloaded, try again later.",
+                },
+                headers = {"Retry-After": str(self.controller.retry_after)},
+            )
+
+            return await response(scope, receive, send)
+
+        timing.checkpoint()
+
+        try:
+            await self.app(scope, receive, send)
+
+        finally:
+            self.controller.release()
@@ -0,0 +1,200 @@
+## -- Importing External Modules -- ##
+from fastapi.responses import JSONResponse
+from collections import OrderedDict
+from time import monotonic
+import math
+
+## -- Importing Internal Modules -- ##
+from app.middlewares.admission import EXEMPT_PATHS
+from app.settings import env_int, env_float, env_str
+
+
+class RateLimiter:
+    """
+    Token bucket per client: each one holds up to "burst" tokens, refilled at
+    "rate" tokens per second, and every request takes one.
+
+    The buckets are kept from the least to the most recently used, so the
+    idle ones (already refilled, the same as a new bucket) are dropped from
+    the front and at most "max_clients" are kept. Everything is O(1) per
+    request (amortized for the cleanup).
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        max_clients: int = 10000,
+        key_header: str = "X-API-Key",
+        api_keys: frozenset = frozenset(),
+        clock = monotonic,
+    ):
+
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.key_header = key_header
+        self.api_keys = frozenset(api_keys)
+        self.clock = clock
+
+        # Seconds for an empty bucket to be full again
+        self.refill_time = burst / rate if rate > 0 else 0
+
+        # key -> [tokens, updated_at]
+        self.buckets = OrderedDict()
+
+        self.allowed = 0
+        self.limited = 0
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+
+        return cls(
+            rate = env_float("TD_RATE_LIMIT", 0),
+            burst = env_int("TD_RATE_BURST", 20),
+            max_clients = env_int("TD_RATE_MAX_CLIENTS", 10000),
+            key_header = env_str("TD_RATE_KEY_HEADER", "X-API-Key"),
+            api_keys = frozenset(
+                key.strip()
+                for key in env_str("TD_RATE_API_KEYS", "").split(",")
+                if key.strip()
+            ),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _cleanup(self, now: float):
+
+        while self.buckets:
+
+            _, updated_at = next(iter(self.buckets.values()))
+
+            if now - updated_at < self.refill_time:
+                break
+
+            self.buckets.popitem(last = False)
+
+    def hit(self, key: str) -> tuple:
+        """
+        Take a token of "key", returning (allowed, tokens left, seconds
+        until the bucket is full again, seconds until the next token)
+        """
+
+        now = self.clock()
+        self._cleanup(now)
+
+        bucket = self.buckets.get(key)
+
+        if bucket is None:
+            tokens = self.burst
+
+        else:
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            self.buckets.move_to_end(key)
+
+        allowed = tokens >= 1
+
+        if allowed:
+            tokens -= 1
+            self.allowed += 1
+
+        else:
+            self.limited += 1
+
+        self.buckets[key] = [tokens, now]
+
+        if len(self.buckets) > self.max_clients:
+            self.buckets.popitem(last = False)
+
+        return (
+            allowed,
+            int(tokens),
+            (self.burst - tokens) / self.rate,
+            0.0 if allowed else (1 - tokens) / self.rate,
+        )
+
+    def stats(self) -> dict:
+
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "clients": len(self.buckets),
+            "max_clients": self.max_clients,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying the RateLimiter to the http requests, by the
+    API key header when it is one of the known "api_keys" or by the client
+    ip otherwise (any other key would get a new bucket on every request).
+    Limited requests get a 429, and every response carries the RateLimit-*
+    headers.
+    """
+
+    def __init__(self, app, limiter: RateLimiter):
+
+        self.app = app
+        self.limiter = limiter
+        self.key_header = limiter.key_header.lower().encode()
+
+    def client_key(self, scope) -> str:
+
+        for name, value in scope["headers"]:
+
+            if name == self.key_header:
+
+                key = value.decode("latin-1")
+
+                if key in self.limiter.api_keys:
+                    return "key:" + key
+
+                break
+
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    async def __call__(self, scope, receive, send):
+
+        if (
+            scope["type"] != "http"
+            or not self.limiter.enabled
+            or scope["path"].startswith(EXEMPT_PATHS)
+        ):
+            return await self.app(scope, receive, send)
+
+        allowed, remaining, reset, retry_after = self.limiter.hit(self.client_key(scope))
+
+        headers = [
+            (b"ratelimit-limit", str(self.limiter.burst).encode()),
+            (b"ratelimit-remaining", str(remaining).encode()),
+            (b"ratelimit-reset", str(math.ceil(reset)).encode()),
+        ]
+
+        if not allowed:
+
+            response = JSONResponse(
+                status_code = 429,
+                content = {
+                    "status": "error",
+                    "message": "Too many requests, slow down.",
+                },
+            )
+
+            response.raw_headers.extend(headers)
+            response.raw_headers.append((b"retry-after", str(math.ceil(retry_after)).encode()))
+
+            return await response(scope, receive, send)
+
+        async def send_with_headers(message):
+
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *headers]
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,22 @@
+## -- Importing External Modules -- ##
+from prometheus_client import CONTENT_TYPE_LATEST
+from fastapi.responses import Response
+from fastapi import APIRouter
+
+## -- Importing Internal Modules -- ##
+from app.services import metrics as service_metrics
+
+router = APIRouter()
+
+@router.get("/metrics", summary = "Prometheus Metrics")
+def metrics() -> Response:
+    """
+    Request, upstream and cache metrics of every worker, on the prometheus
+    text format
+    """
+
+    return Response(
+        status_code = 200,
+        content = service_metrics.render(),
+        media_type = CONTENT_TYPE_LATEST,
+    )
@@ -0,0 +1,19 @@
+## -- Importing External Modules -- ##
+from fastapi.responses import Response
+from fastapi import APIRouter, Request
+
+## -- Importing Internal Modules -- ##
+
+router = APIRouter()
+
+@router.get("/openapi.json", include_in_schema = False)
+def openapi(request: Request) -> Response:
+    """
+    OpenAPI document, prebuilt or generated once (see OpenApiDocument)
+    """
+
+    return Response(
+        status_code = 200,
+        content = request.app.state.openapi.get(),
+        media_type = "application/json",
+    )
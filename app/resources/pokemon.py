@@ -1,13 +1,24 @@
 ## -- Importing External Modules -- ##
-from fastapi.encoders import jsonable_encoder
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
-from aiohttp import ClientSession
+from fastapi.responses import Response, StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query
+from pydantic import ValidationError
+import asyncio
 
 ## -- Importing Internal Modules -- ##
+from app.services.projection import parse_fields
+from app.services.pokedex import Pokedex
+from app.services.name_index import NameIndex
+from app.services import timing
+from app.services.entry import PokemonEntry, dumps
+from app.services.compression import choose_encoding
+from app.services.http_cache import etag_matches, format_etag, freshness_headers
+from app.dependencies import get_names, get_pokedex
+from app.settings import env_int
 from app.interfaces.pokemon_interface import (
     Pokemon,
+    BatchRequest,
     ErrorResponse,
+    SearchResponse,
     SuccessResponse,
 )
 
@@ -18,45 +29,313 @@ router = APIRouter(
 responses = {
     200: {"model": SuccessResponse},
     400: {"model": ErrorResponse},
+    404: {"model": ErrorResponse},
 }
 
+batch_responses = {
+    200: {
+        "content": {"application/x-ndjson": {}},
+        "description": "One json line per pokemon, in the order they are found.",
+    },
+    400: {"model": ErrorResponse},
+}
+
+search_responses = {
+    200: {"model": SearchResponse},
+    503: {"model": ErrorResponse},
+}
+
+fields_query = Query(
+    None,
+    description = (
+        "Comma separated dotted paths of the info to be returned, "
+        "like \"types,stats.base_stat,abilities.ability.name\" (all of it by default)"
+    ),
+)
+
+async def entry_response(
+    entry: PokemonEntry,
+    fields: tuple,
+    accept_encoding: str = None,
+    if_none_match: str = None,
+    headers: dict = None,
+) -> Response:
+    """
+    Success response with the (precompressed) body variant accepted by the
+    client, or an empty 304 when the client already has it. Only the
+    coding sent is compressed, and nothing is on a 304
+    """
+
+    fields = entry.selection(fields)
+    encoding = choose_encoding(accept_encoding, entry.codings(fields))
+    tag = entry.etag(fields)
+
+    headers = {
+        **(headers or {}),
+        "ETag": format_etag(tag, encoding),
+        "Vary": "Accept-Encoding",
+    }
+
+    if if_none_match and etag_matches(if_none_match, tag):
+        return Response(status_code = 304, headers = headers)
+
+    if encoding == "identity":
+        content = entry.body(fields)
+
+    else:
+        content = await entry.encode(fields, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return Response(
+        status_code = 200,
+        content = content,
+        headers = headers,
+        media_type = "application/json",
+    )
+
+
+class PokemonNotFound(HTTPException):
+    """
+    404 carrying the "did you mean" names close to the one not found
+    """
+
+    def __init__(self, suggestions: list = None):
+
+        super().__init__(status_code = 404, detail = "Pokemon not found.")
+        self.data = {"suggestions": suggestions} if suggestions else None
+
+
+async def find(pokedex: Pokedex, names: NameIndex, request: Pokemon) -> PokemonEntry:
+    """
+    Look the pokemon up by its canonical key, suggesting close names (from
+    the local index, with no other upstream call) when a name is not found
+    """
+
+    key = request.canonical_key(names)
+
+    # None when the index already knows the pokemon does not exist
+    if key is not None:
+
+        try:
+            return await pokedex.lookup(key)
+
+        except HTTPException as exc:
+
+            if exc.status_code != 404:
+                raise
+
+    suggestions = names.suggest(request.name) if names is not None and request.name else None
+
+    raise PokemonNotFound(suggestions)
+
+
+def parse_item(item) -> Pokemon:
+    """
+    Validate a batch item with the same rules of the single lookup
+    """
+
+    if isinstance(item, str):
+        item = {"name": item}
+
+    elif isinstance(item, int) and not isinstance(item, bool):
+        item = {"id": item}
+
+    elif not isinstance(item, dict):
+        raise HTTPException(
+            status_code = 400,
+            detail = "Each pokemon should be given by a name, an id or an object."
+        )
+
+    return Pokemon.parse_obj(item)
+
+
 @router.post("", responses = responses, summary = "Pokemon Info")
-async def pokemon_info(request: Pokemon) -> dict:
+async def pokemon_info(
+    request: Pokemon,
+    fields: str = fields_query,
+    accept_encoding: str = Header(None, include_in_schema = False),
+    if_none_match: str = Header(None, include_in_schema = False),
+    pokedex: Pokedex = Depends(get_pokedex),
+    names: NameIndex = Depends(get_names),
+) -> dict:
     """
     Fetch the data of a pokemon with its name or national dex nº
 
     - Remenbering that "id" and "name" should not be provided at the same time
+    - The "fields" query restricts the info returned to the given paths
+    - Send back the "ETag" received on the "If-None-Match" header to get an
+      empty 304 response while the info did not change
+    - A name that is not found comes with "suggestions" of close names
     """
 
-    domain = "https://pokeapi.co"
-    
-    if request.name:
-        url = f"/api/v1/pokemon/{request.name}"
+    timing.mark("validate")
 
-    else:
-        url = f"/api/v1/pokemon/{request.id}"
-    
-    async with ClientSession(domain) as session:
-        async with session.post(url) as response:
+    with timing.phase("lookup"):
+        entry = await find(pokedex, names, request)
+
+    with timing.phase("render"):
+        return await entry_response(entry, parse_fields(fields), accept_encoding, if_none_match)
 
-            if response.status == 404:
-                raise HTTPException(
-                    status_code = 404,
-                    detail = "Pokemon not found."
-                )
 
-            data = await response.json()
+@router.get("/search", responses = search_responses, summary = "Pokemon Name Search")
+async def pokemon_search(
+    q: str = Query(..., min_length = 1, max_length = 64, description = "Start or (misspelled) whole of a pokemon name"),
+    limit: int = Query(10, ge = 1, le = 50, description = "Max names returned"),
+    names: NameIndex = Depends(get_names),
+) -> dict:
+    """
+    Autocomplete and fuzzy search of pokemon names, from a local index (the
+    PokeAPI is not called)
 
-    rtn_data = {
+    - The names starting with "q" come first (shortest first), then the
+      ones a few edits away from it (closest first)
+    """
+
+    if names is None or not names.loaded:
+        raise HTTPException(
+            status_code = 503,
+            detail = "Pokemon names are not loaded yet.",
+            headers = {"Retry-After": "5"},
+        )
+
+    return {
         "status": "success",
-        "message": "Pokemon info was found.",
+        "message": "Pokemon names were searched.",
         "data": {
-            "name": data.get("name").capitalize(),
-            "info": data,
+            "query": q,
+            "results": names.search(q, limit),
         },
     }
 
-    return JSONResponse(
+
+@router.get("/{id_or_name}", responses = responses, summary = "Pokemon Info (cacheable)")
+async def pokemon_info_by_path(
+    id_or_name: str = Path(..., description = "Pokemon`s national dex number or name"),
+    fields: str = fields_query,
+    accept_encoding: str = Header(None, include_in_schema = False),
+    if_none_match: str = Header(None, include_in_schema = False),
+    pokedex: Pokedex = Depends(get_pokedex),
+    names: NameIndex = Depends(get_names),
+):
+    """
+    Fetch the data of a pokemon with its name or national dex nº, the same
+    as the POST lookup but cacheable by browsers, proxies and CDNs
+
+    - The "fields" query restricts the info returned to the given paths
+    - The response carries "Cache-Control"/"Expires" headers and a link to
+      its canonical url (by the lowercased name)
+    """
+
+    request = parse_item(int(id_or_name) if id_or_name.isdecimal() else id_or_name)
+    timing.mark("validate")
+
+    with timing.phase("lookup"):
+        entry = await find(pokedex, names, request)
+
+    canonical = f"{router.prefix}/{entry.name.lower()}"
+
+    headers = {
+        **freshness_headers(
+            env_int("TD_HTTP_MAX_AGE", 3600),
+            env_int("TD_HTTP_STALE_WHILE_REVALIDATE", 60),
+        ),
+        "Content-Location": canonical,
+        "Link": f'<{canonical}>; rel="canonical"',
+    }
+
+    with timing.phase("render"):
+        return await entry_response(entry, parse_fields(fields), accept_encoding, if_none_match, headers)
+
+
+@router.post("/batch", responses = batch_responses, summary = "Pokemon Batch Info")
+async def pokemon_batch(
+    request: BatchRequest,
+    fields: str = fields_query,
+    pokedex: Pokedex = Depends(get_pokedex),
+    names: NameIndex = Depends(get_names),
+):
+    """
+    Fetch the data of several pokemon at once, each one given by its name,
+    national dex nº or an object like the one of the single lookup
+
+    - The results are streamed as newline delimited json as soon as each
+      pokemon is found, carrying the "index" of the pokemon on the request
+    - A pokemon that fails is reported on its own line and does not fail
+      the others
+    - The "fields" query restricts the info returned to the given paths
+    """
+
+    fields = parse_fields(fields)
+
+    max_size = env_int("TD_BATCH_MAX_SIZE", 100)
+
+    if len(request.pokemon) > max_size:
+        raise HTTPException(
+            status_code = 400,
+            detail = f"At most {max_size} pokemon can be requested at once."
+        )
+
+    semaphore = asyncio.Semaphore(env_int("TD_BATCH_CONCURRENCY", 10))
+
+    async def fetch_line(index: int, item) -> bytes:
+
+        try:
+            lookup = parse_item(item)
+
+            async with semaphore:
+                entry = await find(pokedex, names, lookup)
+
+            # Splices the index into the already rendered body
+            return b'{"index":%d,%s\n' % (index, entry.body(entry.selection(fields))[1:])
+
+        except HTTPException as exc:
+            content = {
+                "index": index,
+                "status": "error",
+                "status_code": exc.status_code,
+                "message": str(exc.detail).capitalize(),
+                **({"data": exc.data} if getattr(exc, "data", None) else {}),
+            }
+
+        except ValidationError as exc:
+            content = {
+                "index": index,
+                "status": "error",
+                "status_code": 400,
+                "message": "; ".join(
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                    for error in exc.errors()
+                ).capitalize(),
+            }
+
+        except Exception:
+            content = {
+                "index": index,
+                "status": "error",
+                "status_code": 500,
+                "message": "Internal Server Error",
+            }
+
+        return dumps(content) + b"\n"
+
+    async def stream_lines():
+
+        tasks = [
+            asyncio.ensure_future(fetch_line(index, item))
+            for index, item in enumerate(request.pokemon)
+        ]
+
+        try:
+            for next_line in asyncio.as_completed(tasks):
+                yield await next_line
+
+        finally:
+            # The client went away before the end of the batch
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(
+        stream_lines(),
         status_code = 200,
-        content = jsonable_encoder(rtn_data),
-    )
\ No newline at end of file
+        media_type = "application/x-ndjson",
+    )
@@ -0,0 +1,29 @@
+## -- Importing External Modules -- ##
+from fastapi import APIRouter, Request
+
+## -- Importing Internal Modules -- ##
+
+router = APIRouter(
+    prefix = "/status"
+)
+
+@router.get("", summary = "Service Status")
+async def service_status(request: Request) -> dict:
+    """
+    Readout of the internal state of the api (connection pool usage, etc.)
+    """
+
+    state = request.app.state
+
+    return {
+        "status": "success",
+        "message": "Service status.",
+        "data": {
+            "upstream": state.upstream.pool_stats(),
+            "breaker": state.upstream.breaker.stats(),
+            "admission": state.admission.stats(),
+            "rate_limit": state.rate_limiter.stats(),
+            "names": state.names.stats() if state.names is not None else None,
+            **state.pokedex.stats(),
+        },
+    }
@@ -1,28 +1,162 @@
 ## -- Importing External Modules -- ##
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
+from starlette.routing import Match
 from timeit import default_timer as timer
+import logging
 
 ## -- Importing Internal Modules -- ##
-from app.resources import pokemon
+from app.middlewares.admission import AdmissionController, AdmissionMiddleware
+from app.middlewares.rate_limit import RateLimiter, RateLimitMiddleware
+from app.resources import metrics as metrics_resource, openapi as openapi_resource, pokemon, status
+from app.services import metrics, timing
+from app.settings import env_bool
+from app.services.upstream import UpstreamClient
+from app.services.openapi import OpenApiDocument
+from app.services.pokedex import Pokedex
+from app.services.name_index import NameIndex
 from app.server import app
 
 app.include_router(pokemon.router)
+app.include_router(status.router)
+app.include_router(metrics_resource.router)
+
+# Replaces the FastAPI route of the OpenAPI document, that would encode it
+# again on every request
+app.router.routes[:] = [route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url]
+app.state.openapi = OpenApiDocument.from_env(app)
+app.include_router(openapi_resource.router)
+
+## Events
+
+@app.on_event("startup")
+async def open_upstream():
+
+    app.state.upstream = UpstreamClient.from_env()
+    await app.state.upstream.start()
+
+    app.state.names = NameIndex.from_env()
+
+    app.state.pokedex = Pokedex.from_env(app.state.upstream, app.state.names)
+    app.state.pokedex.open()
+
+    if app.state.names is not None:
+        app.state.names.start(app.state.pokedex.pokemon)
+
+@app.on_event("shutdown")
+async def close_upstream():
+
+    if app.state.names is not None:
+        app.state.names.close()
+
+    app.state.pokedex.close()
+    await app.state.upstream.close()
 
 ## Middlewares
 
+server_timing = env_bool("TD_SERVER_TIMING", True)
+timing_log = env_bool("TD_TIMING_LOG", False)
+timing_logger = logging.getLogger("pokemon_api.timing")
+
+# Added first so they run inside the timing middleware, the rate limit
+# before the admission so a limited client never takes a slot
+app.state.admission = AdmissionController.from_env()
+app.add_middleware(AdmissionMiddleware, controller = app.state.admission)
+
+app.state.rate_limiter = RateLimiter.from_env()
+app.add_middleware(RateLimitMiddleware, limiter = app.state.rate_limiter)
+
+# endpoint -> path template, used as the route label of the metrics
+route_paths = {}
+
+def route_label(request: Request) -> str:
+
+    if not route_paths:
+        route_paths.update(
+            (route.endpoint, route.path)
+            for route in app.routes
+            if hasattr(route, "endpoint")
+        )
+
+    endpoint = request.scope.get("endpoint")
+
+    if endpoint is not None:
+        return route_paths.get(endpoint, "unmatched")
+
+    # Requests answered before the routing (rate limited or shed) are
+    # matched here, so they are still counted by route
+    for route in app.router.routes:
+
+        match, _ = route.matches(request.scope)
+
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+
+    # Unmatched paths share a label, so they can not blow up the series
+    return "unmatched"
+
+async def count_body(body_iterator, route: str):
+
+    size = 0
+
+    async for chunk in body_iterator:
+        size += len(chunk)
+        yield chunk
+
+    metrics.RESPONSE_SIZE.labels(route).observe(size)
+
+def record_request(request: Request, status_code: int, process_time: float) -> str:
+    """
+    Count the request on the metrics, returning its route label
+    """
+
+    route = route_label(request)
+    labels = (route, request.method, str(status_code))
+
+    metrics.REQUESTS.labels(*labels).inc()
+    metrics.REQUEST_LATENCY.labels(*labels).observe(process_time)
+
+    return route
+
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
 
     # Before request
     start_time = timer()
+    timings = timing.start()
+    metrics.IN_FLIGHT.inc()
+
+    try:
+        response = await call_next(request)
 
-    response = await call_next(request)
+    except Exception:
+        # Answered with a 500 by the universal handler, still counted
+        record_request(request, 500, timer() - start_time)
+        raise
+
+    finally:
+        metrics.IN_FLIGHT.dec()
     
     # After request
     process_time = timer() - start_time
 
+    route = record_request(request, response.status_code, process_time)
+
+    response.body_iterator = count_body(response.body_iterator, route)
+
     response.headers["X-Process-Time"] = str(process_time)
+
+    if server_timing or timing_log:
+        breakdown = timings.header(process_time)
+
+        if server_timing:
+            response.headers["Server-Timing"] = breakdown
+
+        if timing_log:
+            timing_logger.info(
+                "%s %s %s %s", request.method, request.url.path, response.status_code, breakdown
+            )
+
     return response
 
 ## Handlers
@@ -40,10 +174,17 @@ async def universal_exception_handler(request: Request, exc: Exception):
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
 
+    content = {
+        "status": "error",
+        "message": str(exc.detail).capitalize(),
+    }
+
+    # Extra info of the error, like the suggestions of a pokemon not found
+    if getattr(exc, "data", None):
+        content["data"] = exc.data
+
     return JSONResponse(
         status_code = exc.status_code,
-        content = {
-            "status": "error",
-            "message": str(exc.detail).capitalize(),
-        },
+        content = content,
+        headers = getattr(exc, "headers", None),
     )
\ No newline at end of file
@@ -0,0 +1,149 @@
+## -- Importing External Modules -- ##
+from collections import OrderedDict
+from time import monotonic
+
+## -- Importing Internal Modules -- ##
+from app.settings import env_int, env_float
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+
+class TTLCache:
+    """
+    In-process cache evicting the least recently used entries once "maxsize"
+    is reached and expiring entries older than "ttl" seconds.
+
+    Entries older than "soft_ttl" (but not "ttl") are stale: still served,
+    but due a refresh. Expired entries are kept for "grace" more seconds so
+    they can still be served when a fresh one can not be fetched.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: float = 300.0,
+        soft_ttl: float = None,
+        grace: float = 0,
+        clock = monotonic,
+    ):
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.soft_ttl = ttl if soft_ttl is None else min(soft_ttl, ttl)
+        self.grace = grace
+        self.clock = clock
+
+        # key -> (stale_at, expires_at, value), ordered from least to most
+        # recently used
+        self._data = OrderedDict()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls, prefix: str = "TD_CACHE", maxsize: int = 512, ttl: float = 300.0) -> "TTLCache":
+
+        ttl = env_float(f"{prefix}_TTL", ttl)
+
+        return cls(
+            maxsize = env_int(f"{prefix}_SIZE", maxsize),
+            ttl = ttl,
+            soft_ttl = env_float(f"{prefix}_SOFT_TTL", ttl),
+            grace = env_float(f"{prefix}_STALE_GRACE", 0),
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+
+        item = self._data.get(key)
+        return item is not None and item[1] > self.clock()
+
+    def lookup(self, key) -> tuple:
+        """
+        (value, state) of "key", the state being FRESH, STALE, EXPIRED (only
+        while on the grace period) or None when there is no value
+        """
+
+        item = self._data.get(key)
+
+        if item is None:
+            self.misses += 1
+            return None, None
+
+        stale_at, expires_at, value = item
+        now = self.clock()
+
+        if expires_at <= now:
+
+            self.misses += 1
+
+            if expires_at + self.grace <= now:
+                del self._data[key]
+                self.expirations += 1
+                return None, None
+
+            return value, EXPIRED
+
+        self._data.move_to_end(key)
+
+        if stale_at <= now:
+            self.stale_hits += 1
+            return value, STALE
+
+        self.hits += 1
+        return value, FRESH
+
+    def get(self, key, default = None):
+
+        value, state = self.lookup(key)
+        return value if state in (FRESH, STALE) else default
+
+    def set(self, key, value, ttl: float = None):
+
+        if self.maxsize <= 0:
+            return
+
+        now = self.clock()
+
+        if ttl is None:
+            ttl, soft_ttl = self.ttl, self.soft_ttl
+
+        else:
+            soft_ttl = ttl
+
+        self._data[key] = (now + soft_ttl, now + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last = False)
+            self.evictions += 1
+
+    def pop(self, key, default = None):
+
+        item = self._data.pop(key, None)
+        return default if item is None else item[2]
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "soft_ttl": self.soft_ttl,
+            "grace": self.grace,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
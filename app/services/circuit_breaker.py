@@ -0,0 +1,110 @@
+## -- Importing External Modules -- ##
+from time import monotonic
+
+## -- Importing Internal Modules -- ##
+from app.settings import env_int, env_float
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+
+    def __init__(self, retry_after: float):
+
+        super().__init__("Circuit is open")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Fail fast while a dependency is unhealthy.
+
+    After "failures" consecutive failures the circuit opens and every call
+    is refused for "reset_timeout" seconds. Then it half-opens, letting a
+    single probe call through: its success closes the circuit again and its
+    failure opens it for another "reset_timeout".
+    """
+
+    def __init__(self, failures: int = 5, reset_timeout: float = 30.0, clock = monotonic):
+
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probing = False
+
+        self.opened = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+
+        return cls(
+            failures = env_int("TD_BREAKER_FAILURES", 5),
+            reset_timeout = env_float("TD_BREAKER_RESET_TIMEOUT", 30.0),
+        )
+
+    def before_call(self):
+        """
+        Raise CircuitOpenError if the call should not be made
+        """
+
+        if self.state == OPEN:
+
+            elapsed = self.clock() - self.opened_at
+
+            if elapsed < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self.reset_timeout - elapsed)
+
+            self.state = HALF_OPEN
+
+        if self.state == HALF_OPEN:
+
+            if self.probing:
+                self.rejected += 1
+                raise CircuitOpenError(self.reset_timeout)
+
+            self.probing = True
+
+    def release(self):
+        """
+        End a call without a result (cancelled), freeing the probe
+        """
+
+        self.probing = False
+
+    def record_success(self):
+
+        self.probing = False
+        self.consecutive_failures = 0
+        self.state = CLOSED
+
+    def record_failure(self):
+
+        self.probing = False
+        self.consecutive_failures += 1
+
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failures:
+
+            if self.state != OPEN:
+                self.opened += 1
+
+            self.state = OPEN
+            self.opened_at = self.clock()
+
+    def stats(self) -> dict:
+
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failures": self.failures,
+            "reset_timeout": self.reset_timeout,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,109 @@
+## -- Importing External Modules -- ##
+from functools import lru_cache
+import gzip
+
+try:
+    import brotli
+
+except ImportError:
+    brotli = None
+
+## -- Importing Internal Modules -- ##
+
+# Bodies smaller than this are not worth compressing
+min_size = 512
+
+# Content-codings offered, from the most to the least preferred
+preference = ("br", "gzip")
+
+
+def offered(body: bytes) -> tuple:
+    """
+    Content-codings "body" can be sent with, none when it is too small to
+    be worth compressing
+    """
+
+    if len(body) < min_size:
+        return ()
+
+    return preference if brotli is not None else ("gzip",)
+
+
+def compress_as(body: bytes, coding: str) -> bytes:
+    """
+    "body" compressed with one of the offered content-codings
+    """
+
+    if coding == "br":
+        return brotli.compress(body, quality = 5)
+
+    return gzip.compress(body, compresslevel = 6, mtime = 0)
+
+
+def compress(body: bytes) -> dict:
+    """
+    Compressed variants of "body" by content-coding (every offered one)
+    """
+
+    return {coding: compress_as(body, coding) for coding in offered(body)}
+
+
+@lru_cache(maxsize = 256)
+def parse_accept_encoding(accept_encoding: str) -> dict:
+    """
+    Quality value ("q") of each content-coding of an Accept-Encoding header
+    """
+
+    accepted = {}
+
+    for item in accept_encoding.split(","):
+
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+
+        if not coding:
+            continue
+
+        quality = 1.0
+
+        for param in params:
+
+            name, _, value = param.partition("=")
+
+            if name.strip().lower() == "q":
+
+                try:
+                    quality = float(value)
+
+                except ValueError:
+                    quality = 0.0
+
+        accepted[coding] = quality
+
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available) -> str:
+    """
+    Best of the "available" content-codings accepted by the client, or
+    "identity" when none of them is
+    """
+
+    if not accept_encoding or not available:
+        return "identity"
+
+    accepted = parse_accept_encoding(accept_encoding)
+
+    best, best_quality = "identity", 0.0
+
+    for coding in preference:
+
+        if coding not in available:
+            continue
+
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+
+        if quality > best_quality:
+            best, best_quality = coding, quality
+
+    return best
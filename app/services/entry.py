@@ -0,0 +1,176 @@
+## -- Importing External Modules -- ##
+from collections import OrderedDict
+import asyncio, hashlib, json
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None
+
+## -- Importing Internal Modules -- ##
+from app.services.projection import build_tree, has_path, project
+from app.services.compression import compress, compress_as, offered
+
+
+def dumps(value) -> bytes:
+    """
+    Compact json serialization, using orjson when it is installed
+    """
+
+    if orjson is not None:
+        return orjson.dumps(value)
+
+    return json.dumps(value, separators = (",", ":"), ensure_ascii = False).encode()
+
+
+class PokemonEntry:
+    """
+    A cached pokemon payload, along with the response bodies already
+    rendered (and compressed) from it and their ETags.
+
+    The full body splices the raw upstream bytes into the success envelope,
+    so it is built without encoding the payload again.
+
+    Projections are memoized by their paths found on the payload (see
+    "selection"), keeping only the "max_projections" most recently used.
+    """
+
+    __slots__ = ("key", "raw", "data", "full", "projections")
+
+    prefix = b'{"status":"success","message":"Pokemon info was found.","data":{"name":'
+
+    # Bound of memoized projections per entry, as "fields" comes from clients
+    max_projections = 16
+
+    # Selection of none of the payload, when every path asked is unknown
+    nothing = ("",)
+
+    def __init__(self, key: str, raw: bytes, data: dict):
+
+        # Keeps every body on a single line (the batch streams json lines)
+        if b"\n" in raw:
+            raw = dumps(data)
+
+        self.key = key
+        self.raw = raw
+        self.data = data
+        self.full = {"variants": {}}
+        self.projections = OrderedDict()
+
+    @property
+    def name(self) -> str:
+        return self.data.get("name")
+
+    def selection(self, fields: tuple) -> tuple:
+        """
+        The "fields" paths found on the payload, the ones its bodies are
+        rendered (and memoized) for
+        """
+
+        if not fields:
+            return ()
+
+        return tuple(path for path in fields if has_path(self.data, path)) or self.nothing
+
+    def memo(self, fields: tuple) -> dict:
+        """
+        What was rendered for the body restricted to "fields", dropping the
+        least recently used projection past "max_projections"
+        """
+
+        if not fields:
+            return self.full
+
+        memo = self.projections.get(fields)
+
+        if memo is None:
+
+            memo = self.projections[fields] = {"variants": {}}
+
+            if len(self.projections) > self.max_projections:
+                self.projections.popitem(last = False)
+
+        else:
+            self.projections.move_to_end(fields)
+
+        return memo
+
+    def project(self, fields: tuple) -> dict:
+        """
+        The payload restricted to the normalized "fields" paths (all of it
+        when there is none)
+        """
+
+        if not fields:
+            return self.data
+
+        return project(self.data, build_tree(fields))
+
+    def body(self, fields: tuple = ()) -> bytes:
+        """
+        The json body of the success response, restricted to the "fields"
+        of a selection
+        """
+
+        memo = self.memo(fields)
+        body = memo.get("body")
+
+        if body is None:
+
+            info = dumps(self.project(fields)) if fields else self.raw.strip()
+
+            body = memo["body"] = b"".join((
+                self.prefix,
+                dumps(self.name.capitalize()),
+                b',"info":',
+                info,
+                b"}}",
+            ))
+
+        return body
+
+    def variants(self, fields: tuple = ()) -> dict:
+        """
+        Every compressed form of the body restricted to "fields", by
+        content-coding (done ahead for the full body, see Pokedex.load)
+        """
+
+        variants = compress(self.body(fields))
+        self.memo(fields)["variants"].update(variants)
+
+        return variants
+
+    def codings(self, fields: tuple = ()) -> tuple:
+        """
+        Content-codings the body restricted to "fields" can be sent with
+        """
+
+        return offered(self.body(fields))
+
+    async def encode(self, fields: tuple, coding: str) -> bytes:
+        """
+        The body restricted to "fields" compressed with "coding", only that
+        one and away from the event loop when not done yet
+        """
+
+        variants = self.memo(fields)["variants"]
+        content = variants.get(coding)
+
+        if content is None:
+            content = variants[coding] = await asyncio.to_thread(compress_as, self.body(fields), coding)
+
+        return content
+
+    def etag(self, fields: tuple = ()) -> str:
+        """
+        Hash of the body restricted to "fields", to be used as its ETag
+        """
+
+        memo = self.memo(fields)
+        tag = memo.get("etag")
+
+        if tag is None:
+            tag = memo["etag"] = hashlib.blake2b(self.body(fields), digest_size = 16).hexdigest()
+
+        return tag
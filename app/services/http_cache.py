@@ -0,0 +1,62 @@
+## -- Importing External Modules -- ##
+from email.utils import formatdate
+from time import time
+
+## -- Importing Internal Modules -- ##
+
+# HTTP caching helpers (validators and freshness headers) of the responses
+
+
+def format_etag(tag: str, encoding: str = "identity") -> str:
+    """
+    Strong ETag of a representation, distinct for each content-coding
+    """
+
+    if encoding == "identity":
+        return f'"{tag}"'
+
+    return f'"{tag}-{encoding}"'
+
+
+def etag_matches(if_none_match: str, tag: str) -> bool:
+    """
+    If the If-None-Match header matches the tag, with any content-coding
+    (weak comparison, as asked by RFC 9110 for If-None-Match)
+    """
+
+    if if_none_match.strip() == "*":
+        return True
+
+    for candidate in if_none_match.split(","):
+
+        candidate = candidate.strip()
+
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+
+        candidate = candidate.strip('"')
+
+        if candidate == tag or candidate.partition("-")[0] == tag:
+            return True
+
+    return False
+
+
+def freshness_headers(max_age: int, stale_while_revalidate: int = 0) -> dict:
+    """
+    Cache-Control and Expires headers letting shared caches (CDN, reverse
+    proxy) and browsers reuse a response for "max_age" seconds
+    """
+
+    if max_age <= 0:
+        return {"Cache-Control": "no-cache"}
+
+    cache_control = f"public, max-age={max_age}"
+
+    if stale_while_revalidate > 0:
+        cache_control += f", stale-while-revalidate={stale_while_revalidate}"
+
+    return {
+        "Cache-Control": cache_control,
+        "Expires": formatdate(time() + max_age, usegmt = True),
+    }
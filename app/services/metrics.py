@@ -0,0 +1,85 @@
+## -- Importing External Modules -- ##
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+import os
+
+## -- Importing Internal Modules -- ##
+
+# Prometheus metrics of the api. With several workers "main.py" points
+# PROMETHEUS_MULTIPROC_DIR to a folder where each worker keeps its values
+# (on memory mapped files) and the scrape sums all of them up.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1000, 10000, 50000, 100000, 250000, 500000, 1000000)
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requests handled",
+    ["route", "method", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time until the response headers are ready",
+    ["route", "method", "status"],
+    buckets = LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Size of the response bodies sent",
+    ["route"],
+    buckets = SIZE_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being handled",
+    multiprocess_mode = "livesum",
+)
+
+ADMISSION_SHED = Counter(
+    "http_requests_shed_total",
+    "Requests shed by the admission control, because the queue was full or the wait on it timed out",
+    ["reason"],
+)
+
+UPSTREAM_LATENCY = Histogram(
+    "pokemon_upstream_request_duration_seconds",
+    "Time of each call (retries included) to the PokeAPI",
+    ["status"],
+    buckets = LATENCY_BUCKETS,
+)
+UPSTREAM_ERRORS = Counter(
+    "pokemon_upstream_errors_total",
+    "Failed calls to the PokeAPI",
+    ["kind"],
+)
+
+CACHE_REQUESTS = Counter(
+    "pokemon_cache_requests_total",
+    "Lookups on each cache tier, by result",
+    ["tier", "result"],
+)
+
+
+def multiprocess_dir() -> str:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def render() -> bytes:
+    """
+    Metrics on the prometheus text format, summed over every worker
+    """
+
+    if multiprocess_dir() is None:
+        return generate_latest(REGISTRY)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+
+    return generate_latest(registry)
@@ -0,0 +1,342 @@
+## -- Importing External Modules -- ##
+from bisect import bisect_left, insort
+from time import monotonic
+import asyncio, heapq, logging
+
+## -- Importing Internal Modules -- ##
+from app.settings import env_bool, env_float, env_int
+
+logger = logging.getLogger("pokemon_api")
+
+
+def normalize(query: str) -> str:
+    """
+    Name as the PokeAPI writes it: lowercased, with dashes between words
+    """
+
+    return "-".join(query.lower().split())
+
+def trigrams(name: str) -> set:
+    """
+    Three letter pieces of the name, padded so the start and end count
+    """
+
+    padded = f"^{name}$"
+    return {padded[index:index + 3] for index in range(max(1, len(padded) - 2))}
+
+def edit_distance(source: str, target: str, bound: int) -> int:
+    """
+    Damerau-Levenshtein distance (adjacent swaps count as one edit), or
+    bound + 1 as soon as it is sure to be over the bound
+    """
+
+    if abs(len(source) - len(target)) > bound:
+        return bound + 1
+
+    before, previous = None, list(range(len(target) + 1))
+
+    for row, source_char in enumerate(source, 1):
+
+        current = [row] + [0] * len(target)
+
+        for column, target_char in enumerate(target, 1):
+
+            current[column] = min(
+                previous[column] + 1,
+                current[column - 1] + 1,
+                previous[column - 1] + (source_char != target_char),
+            )
+
+            if (
+                before is not None and column > 1
+                and source_char == target[column - 2] and source[row - 2] == target_char
+            ):
+                current[column] = min(current[column], before[column - 2] + 1)
+
+        if min(current) > bound:
+            return bound + 1
+
+        before, previous = previous, current
+
+    return previous[-1]
+
+
+class NameIndex:
+    """
+    In-memory index of every pokemon name and id, answering searches and
+    telling which pokemon exist without calling the PokeAPI.
+
+    Prefixes are found by a binary search on the sorted names, and
+    misspellings by the names sharing most trigrams with the query, ranked
+    by their edit distance to it.
+
+    Names and ids map to each other, so both lookups of a pokemon share a
+    single (id) key and, once the whole list is loaded, unknown names and
+    ids are rejected right away when "strict".
+
+    The list is loaded on the background (from the local snapshot or the
+    PokeAPI), retried until it is and loaded again every "refresh" seconds;
+    every payload fetched in between adds its pokemon too. A rejected
+    lookup loads it again early (at most once every "reload" seconds), so a
+    pokemon newer than the list is found soon after being asked for.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = 2,
+        suggestions: int = 3,
+        retry: float = 60.0,
+        refresh: float = 86400.0,
+        strict: bool = True,
+        reload: float = 300.0,
+    ):
+
+        self.max_distance = max_distance
+        self.suggestions = suggestions
+        self.retry = retry
+        self.refresh = refresh
+        self.strict = strict
+        self.reload = reload
+
+        self.names = []
+        self.grams = {}
+        self.ids = {}
+        self.by_id = {}
+        self.loaded = False
+
+        self.task = None
+        self.wake = asyncio.Event()
+        self.loaded_at = 0.0
+        self.loads = 0
+        self.reloads = 0
+        self.failures = 0
+        self.searches = 0
+        self.learned = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "NameIndex":
+        """
+        None when "TD_NAME_INDEX" turns it off
+        """
+
+        if not env_bool("TD_NAME_INDEX", True):
+            return None
+
+        return cls(
+            max_distance = env_int("TD_NAME_MAX_DISTANCE", 2),
+            suggestions = env_int("TD_NAME_SUGGESTIONS", 3),
+            retry = env_float("TD_NAME_INDEX_RETRY", 60.0),
+            refresh = env_float("TD_NAME_INDEX_REFRESH", 86400.0),
+            strict = env_bool("TD_NAME_INDEX_STRICT", True),
+            reload = env_float("TD_NAME_INDEX_RELOAD", 300.0),
+        )
+
+    @staticmethod
+    def build(pokemon) -> tuple:
+        """
+        (sorted names, trigrams, name -> id, id -> name) of the (id, name) pokemon
+        """
+
+        ids = {normalize(name): id for id, name in pokemon if name}
+        by_id = {id: name for name, id in ids.items()}
+        grams = {}
+
+        for name in ids:
+            for gram in trigrams(name):
+                grams.setdefault(gram, []).append(name)
+
+        return sorted(ids), grams, ids, by_id
+
+    def replace(self, pokemon):
+        """
+        Replace the whole index at once, built away from the event loop
+        """
+
+        self.names, self.grams, self.ids, self.by_id = pokemon
+        self.loaded = bool(self.names)
+        self.loads += 1
+
+    def add(self, id: int, name: str):
+        """
+        Index a pokemon seen on a payload, if it is a new one
+        """
+
+        name = normalize(name)
+
+        if name in self.ids or id in self.by_id:
+            return
+
+        insort(self.names, name)
+
+        for gram in trigrams(name):
+            self.grams.setdefault(gram, []).append(name)
+
+        self.ids[name] = id
+        self.by_id[id] = name
+        self.learned += 1
+
+    def canonical(self, key: str) -> str:
+        """
+        Key shared by the name and the id lookups of a pokemon (its id), the
+        key itself when the pokemon is not indexed or None when it does not
+        exist (a strict index with the whole list loaded)
+        """
+
+        if key.isdecimal():
+            if int(key) in self.by_id:
+                return str(int(key))
+
+        else:
+            id = self.ids.get(normalize(key))
+
+            if id is not None:
+                return str(id)
+
+        if self.strict and self.loaded:
+            self.rejected += 1
+            self.reload_soon()
+            return None
+
+        return key
+
+    def reload_soon(self):
+        """
+        Load the list again right away, unless it was (re)loaded less than
+        "reload" seconds ago
+        """
+
+        if self.task is None or self.reload <= 0 or monotonic() - self.loaded_at < self.reload:
+            return
+
+        # Also keeps the next rejections from asking again meanwhile
+        self.loaded_at = monotonic()
+        self.reloads += 1
+        self.wake.set()
+
+    def start(self, loader):
+        """
+        Load the (id, name) pokemon returned by the "loader" coroutine
+        function on the background, trying again every "retry" seconds while
+        it fails, every "refresh" seconds after and whenever woken by
+        reload_soon
+        """
+
+        if self.task is None:
+            self.task = asyncio.ensure_future(self.keep_loading(loader))
+
+    async def keep_loading(self, loader):
+
+        while True:
+
+            self.wake.clear()
+
+            try:
+                self.replace(await asyncio.to_thread(self.build, await loader()))
+                self.loaded_at = monotonic()
+                delay = self.refresh
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as error:
+                self.failures += 1
+                delay = self.retry
+                logger.warning("Pokemon names could not be loaded, trying again in %ss: %r", self.retry, error)
+
+            try:
+                await asyncio.wait_for(self.wake.wait(), delay if delay > 0 else None)
+
+            except asyncio.TimeoutError:
+                pass
+
+    def close(self):
+
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def complete(self, prefix: str, limit: int) -> list:
+        """
+        Names starting with the prefix, shortest first
+        """
+
+        names = self.names
+        start = bisect_left(names, prefix)
+        end = bisect_left(names, prefix + "\uffff", start)
+
+        return sorted(names[start:end], key = lambda name: (len(name), name))[:limit]
+
+    def similar(self, query: str, limit: int, exclude: set = ()) -> list:
+        """
+        (name, distance) of the names at most "max_distance" edits away,
+        closest first
+        """
+
+        shared = {}
+
+        for gram in trigrams(query):
+            for name in self.grams.get(gram, ()):
+                shared[name] = shared.get(name, 0) + 1
+
+        # Only the best candidates by trigrams get their distance computed
+        candidates = heapq.nlargest(max(50, limit * 5), shared, key = shared.get)
+        bound = min(self.max_distance, max(1, len(query) // 3))
+        found = []
+
+        for name in candidates:
+
+            if name in exclude:
+                continue
+
+            distance = edit_distance(query, name, bound)
+
+            if distance <= bound:
+                found.append((distance, -shared[name], name))
+
+        return [(name, distance) for distance, _, name in sorted(found)[:limit]]
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        Names completing the query, then the ones close to it
+        """
+
+        self.searches += 1
+        query = normalize(query)
+
+        results = [
+            {"name": name, "match": "prefix", "distance": 0}
+            for name in self.complete(query, limit)
+        ]
+
+        if len(results) < limit:
+            results += [
+                {"name": name, "match": "fuzzy", "distance": distance}
+                for name, distance in self.similar(query, limit - len(results), {result["name"] for result in results})
+            ]
+
+        return results
+
+    def suggest(self, name: str) -> list:
+        """
+        "Did you mean" names for a name that was not found
+        """
+
+        if not self.suggestions or not self.names:
+            return []
+
+        return [similar for similar, _ in self.similar(normalize(name), self.suggestions, {normalize(name)})]
+
+    def stats(self) -> dict:
+
+        return {
+            "loaded": self.loaded,
+            "strict": self.strict,
+            "names": len(self.names),
+            "loads": self.loads,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "learned": self.learned,
+            "rejected": self.rejected,
+            "searches": self.searches,
+        }
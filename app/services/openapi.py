@@ -0,0 +1,65 @@
+## -- Importing External Modules -- ##
+from fastapi import FastAPI
+from pathlib import Path
+import json, logging, threading
+
+## -- Importing Internal Modules -- ##
+from app.settings import env_str
+
+logger = logging.getLogger("pokemon_api")
+
+
+def render(app: FastAPI) -> bytes:
+    """
+    The OpenAPI document of the app, with the same bytes FastAPI would answer
+    """
+
+    return json.dumps(app.openapi(), ensure_ascii = False, allow_nan = False, separators = (",", ":")).encode()
+
+
+class OpenApiDocument:
+    """
+    The OpenAPI document behind /docs, kept as bytes.
+
+    It is read from a file pre-generated at build time (tools.build_openapi)
+    when there is one, else generated from the models on first use; either
+    way only once per worker, and never on import.
+    """
+
+    def __init__(self, app: FastAPI, path: str = None):
+
+        self.app = app
+        self.path = path
+
+        self.body = None
+        self.source = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, app: FastAPI) -> "OpenApiDocument":
+        return cls(app, env_str("TD_OPENAPI_PATH", None))
+
+    def get(self) -> bytes:
+
+        if self.body is None:
+
+            with self.lock:
+                if self.body is None:
+                    self.body = self.load()
+
+        return self.body
+
+    def load(self) -> bytes:
+
+        if self.path:
+
+            try:
+                body = Path(self.path).read_bytes()
+                self.source = "prebuilt"
+                return body
+
+            except OSError as error:
+                logger.warning("Generating the OpenAPI document, %s could not be read: %s", self.path, error)
+
+        self.source = "generated"
+        return render(self.app)
@@ -0,0 +1,333 @@
+## -- Importing External Modules -- ##
+from aiohttp import ClientError
+from fastapi import HTTPException
+import asyncio, json
+
+## -- Importing Internal Modules -- ##
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.upstream import UpstreamClient
+from app.services.cache import TTLCache, FRESH, STALE, EXPIRED
+from app.services.singleflight import SingleFlight
+from app.services.store import PayloadStore, SnapshotStore
+from app.services.shared_cache import SharedCache
+from app.services.entry import PokemonEntry
+from app.services.name_index import NameIndex
+from app.services import metrics, timing
+from app.settings import env_str
+
+# Past the number of pokemon, so the PokeAPI list returns all of them
+NAMES_LIMIT = 100000
+
+
+def is_upstream_failure(exc: Exception) -> bool:
+    """
+    If the error comes from the PokeAPI being unavailable (and not from the
+    pokemon not existing)
+    """
+
+    if isinstance(exc, HTTPException):
+        return exc.status_code >= 500
+
+    return isinstance(exc, (ClientError, asyncio.TimeoutError, OSError))
+
+
+class Pokedex:
+    """
+    Lookup of pokemon payloads, answering from the memory cache, the
+    (optional) cache shared by the workers, the (optional) local snapshot or
+    the (optional) persistent store when possible and from the PokeAPI
+    otherwise.
+
+    With the "only" snapshot mode the PokeAPI is never called and a pokemon
+    missing from the snapshot is not found.
+
+    Concurrent misses of the same key share a single upstream call, and a
+    pokemon that is not found is remembered (for a shorter time, on its own
+    smaller cache) so asking for it again does not call the PokeAPI.
+
+    A stale cached entry is served right away while a single background
+    refresh of it runs. An expired one is fetched again, but still served
+    (on its grace period) if the fetch fails because of the PokeAPI.
+    """
+
+    def __init__(
+        self,
+        upstream: UpstreamClient,
+        cache: TTLCache,
+        store: PayloadStore = None,
+        snapshot: SnapshotStore = None,
+        snapshot_mode: str = "fallback",
+        shared: SharedCache = None,
+        negative: TTLCache = None,
+        names: NameIndex = None,
+    ):
+
+        if snapshot_mode not in ("fallback", "only"):
+            raise ValueError(f"Invalid snapshot mode: {snapshot_mode}")
+
+        self.upstream = upstream
+        self.cache = cache
+        self.store = store
+        self.snapshot = snapshot
+        self.shared = shared
+        self.negative = negative if negative is not None else TTLCache(maxsize = 0)
+        self.names = names
+
+        self.refreshing = {}
+        self.refreshes = 0
+        self.stale_served = 0
+        self.offline = snapshot is not None and snapshot_mode == "only"
+        self.flights = SingleFlight()
+
+    @classmethod
+    def from_env(cls, upstream: UpstreamClient, names: NameIndex = None) -> "Pokedex":
+        return cls(
+            upstream,
+            TTLCache.from_env(),
+            store = PayloadStore.from_env(),
+            snapshot = SnapshotStore.from_env(),
+            snapshot_mode = env_str("TD_SNAPSHOT_MODE", "fallback"),
+            shared = SharedCache.from_env(),
+            negative = TTLCache.from_env("TD_NEGATIVE_CACHE", maxsize = 1024, ttl = 60.0),
+            names = names,
+        )
+
+    def open(self):
+
+        if self.shared is not None:
+            self.shared.open()
+
+    async def lookup(self, key: str) -> PokemonEntry:
+        """
+        Return the entry with the PokeAPI payload of the pokemon name or id "key"
+        """
+
+        entry, state = self.cache.lookup(key)
+        metrics.CACHE_REQUESTS.labels("memory", state or "miss").inc()
+
+        if state == FRESH:
+            return entry
+
+        if state == STALE:
+            self.refresh(key)
+            return entry
+
+        if state is None and self.negative.maxsize > 0:
+
+            not_found = self.negative.get(key)
+            metrics.CACHE_REQUESTS.labels("negative", "miss" if not_found is None else "hit").inc()
+
+            if not_found is not None:
+                raise HTTPException(
+                    status_code = 404,
+                    detail = "Pokemon not found."
+                )
+
+        # An expired entry is past the point of being served as it is, so
+        # the copies on the store (which does not expire them) are skipped too
+        refresh = state == EXPIRED
+
+        try:
+            return await self.flights.do(key, lambda: self.load(key, refresh))
+
+        except Exception as exc:
+
+            if isinstance(exc, HTTPException) and exc.status_code == 404:
+                self.negative.set(key, True)
+
+            elif state == EXPIRED and is_upstream_failure(exc):
+                self.stale_served += 1
+                return entry
+
+            raise
+
+    def refresh(self, key: str):
+        """
+        Reload "key" from its source on the background (once at a time)
+        """
+
+        if key in self.refreshing:
+            return
+
+        self.refreshes += 1
+
+        task = asyncio.ensure_future(self.flights.do(key, lambda: self.load(key, refresh = True)))
+        task.add_done_callback(lambda done: self.refreshed(key, done))
+
+        self.refreshing[key] = task
+
+    def refreshed(self, key: str, task: asyncio.Task):
+
+        del self.refreshing[key]
+
+        # A failed refresh keeps the stale entry, retried on the next hit
+        if not task.cancelled():
+            task.exception()
+
+    async def load(self, key: str, refresh: bool = False) -> PokemonEntry:
+        """
+        Load "key" into the memory cache. A refresh skips the persistent
+        store and only takes a payload of the shared cache fetched by
+        another worker since its entry went stale, so the workers of a host
+        refresh a pokemon once
+        """
+
+        body = None
+
+        if self.shared is not None:
+
+            with timing.phase("shared"):
+                body = self.shared.get(key, self.cache.soft_ttl if refresh else None)
+
+            metrics.CACHE_REQUESTS.labels("shared", "miss" if body is None else "hit").inc()
+
+        if body is None:
+            body, fetched = await self.load_body(key, refresh)
+
+            # Payloads of the store keep out, as their age would be lost
+            if self.shared is not None and fetched:
+                self.shared.set(key, body)
+
+        with timing.phase("decode"):
+            entry = PokemonEntry(key, body, json.loads(body))
+
+        # Keeps the index up to date with pokemon newer than its list
+        if self.names is not None and isinstance(entry.data.get("id"), int) and entry.data.get("name"):
+            self.names.add(entry.data["id"], entry.data["name"])
+
+        # Compressed once per entry, away from the event loop
+        with timing.phase("compress"):
+            await asyncio.to_thread(entry.variants)
+
+        self.cache.set(key, entry)
+
+        return entry
+
+    async def load_body(self, key: str, refresh: bool = False) -> tuple:
+        """
+        (raw payload, if it can be shared: it was not read from the store)
+        """
+
+        body = None
+
+        if self.snapshot is not None:
+
+            with timing.phase("snapshot"):
+                body = await self.snapshot.get(key)
+
+            metrics.CACHE_REQUESTS.labels("snapshot", "miss" if body is None else "hit").inc()
+
+        if body is None and self.store is not None and not refresh:
+
+            with timing.phase("store"):
+                body = await self.store.get(key)
+
+            metrics.CACHE_REQUESTS.labels("store", "miss" if body is None else "hit").inc()
+
+            if body is not None:
+                return body, False
+
+        if body is None:
+            body = await self.fetch(key)
+
+            if self.store is not None:
+                await self.store.put(key, body)
+
+        return body, True
+
+    async def fetch(self, key: str) -> bytes:
+
+        if self.offline:
+            raise HTTPException(
+                status_code = 404,
+                detail = "Pokemon not found."
+            )
+
+        return await self.request(f"/api/v2/pokemon/{key}")
+
+    async def pokemon(self) -> list:
+        """
+        (id, name) of every pokemon, from the snapshot or else the PokeAPI list
+        """
+
+        if self.snapshot is not None:
+
+            pokemon = await self.snapshot.pokemon()
+
+            if pokemon or self.offline:
+                return pokemon
+
+        body = await self.request(f"/api/v2/pokemon?limit={NAMES_LIMIT}")
+
+        # The id is only on the url, like "https://pokeapi.co/api/v2/pokemon/25/"
+        return [
+            (int(result["url"].rstrip("/").rsplit("/", 1)[-1]), result["name"])
+            for result in json.loads(body)["results"]
+        ]
+
+    async def request(self, url: str) -> bytes:
+        """
+        Body of a PokeAPI url, its failures turned into HTTP errors
+        """
+
+        try:
+            status, body = await self.upstream.fetch(url)
+
+        except CircuitOpenError as exc:
+            raise HTTPException(
+                status_code = 503,
+                detail = "Pokemon api is unavailable.",
+                headers = {"Retry-After": str(max(1, round(exc.retry_after)))},
+            )
+
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code = 504,
+                detail = "Pokemon api took too long to answer."
+            )
+
+        except ClientError:
+            raise HTTPException(
+                status_code = 502,
+                detail = "Pokemon api is unavailable."
+            )
+
+        if status == 404:
+            raise HTTPException(
+                status_code = 404,
+                detail = "Pokemon not found."
+            )
+
+        if status != 200:
+            raise HTTPException(
+                status_code = 502,
+                detail = "Pokemon api is unavailable."
+            )
+
+        return body
+
+    def close(self):
+
+        for task in self.refreshing.values():
+            task.cancel()
+
+        for store in (self.store, self.snapshot, self.shared):
+
+            if store is not None:
+                store.close()
+
+    def stats(self) -> dict:
+
+        return {
+            "cache": self.cache.stats(),
+            "negative_cache": self.negative.stats(),
+            "flights": self.flights.stats(),
+            "refresh": {
+                "in_flight": len(self.refreshing),
+                "refreshes": self.refreshes,
+                "stale_served": self.stale_served,
+            },
+            "store": self.store.stats() if self.store is not None else None,
+            "snapshot": self.snapshot.stats() if self.snapshot is not None else None,
+            "shared": self.shared.stats() if self.shared is not None else None,
+        }
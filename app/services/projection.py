@@ -0,0 +1,85 @@
+## -- Importing External Modules -- ##
+
+## -- Importing Internal Modules -- ##
+
+# Sparse fieldsets: "fields" is a comma separated list of dotted paths, like
+# "types,stats.base_stat,abilities.ability.name". A path crossing a list is
+# applied to every item of it and unknown paths are ignored (see has_path).
+
+def parse_fields(fields: str) -> tuple:
+    """
+    Normalized (sorted, without duplicates) paths of a "fields" selector
+    """
+
+    if not fields:
+        return ()
+
+    paths = {
+        ".".join(part.strip() for part in path.split("."))
+        for path in fields.lower().split(",")
+    }
+
+    return tuple(sorted(path for path in paths if path and "" not in path.split(".")))
+
+
+def has_path(value, path: str) -> bool:
+    """
+    If the dotted path leads somewhere on "value" (on any item of the
+    lists it crosses, or on an empty one)
+    """
+
+    for index, part in enumerate(path.split(".")):
+
+        if isinstance(value, list):
+            rest = path.split(".", index)[-1]
+            return not value or any(has_path(item, rest) for item in value)
+
+        if not isinstance(value, dict) or part not in value:
+            return False
+
+        value = value[part]
+
+    return True
+
+
+def build_tree(paths: tuple) -> dict:
+    """
+    Turn the paths into a nested dict, where None selects the whole branch
+    """
+
+    tree = {}
+
+    for path in paths:
+
+        node = tree
+        *parents, leaf = path.split(".")
+
+        for part in parents:
+            node = node.setdefault(part, {})
+
+            # A shorter path already selected the whole branch
+            if node is None:
+                break
+
+        else:
+            node[leaf] = None
+
+    return tree
+
+
+def project(value, tree: dict):
+
+    if tree is None:
+        return value
+
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+
+    if isinstance(value, dict):
+        return {
+            key: project(value[key], subtree)
+            for key, subtree in tree.items()
+            if key in value
+        }
+
+    return value
@@ -0,0 +1,237 @@
+## -- Importing External Modules -- ##
+from contextlib import contextmanager
+from time import time
+import hashlib, mmap, os, struct, zlib
+
+try:
+    import fcntl
+
+except ImportError:
+    fcntl = None
+
+## -- Importing Internal Modules -- ##
+from app.settings import env_str, env_int, env_float
+
+
+class SharedCache:
+    """
+    Payload cache shared by every worker process of the host, on a memory
+    mapped file (by default on "/dev/shm", so it lives in memory).
+
+    The file holds a header, an open addressing hash index of "slots" and
+    an arena where the records are appended as a ring, overwriting the
+    oldest ones once it is full. Writers hold an exclusive file lock, readers
+    do not lock at all and check the crc of what they read instead, so a
+    record overwritten (or being written) meanwhile is just a miss.
+
+    It only shares the payloads, so a pokemon is fetched once per host:
+    each worker still decodes (and renders) the ones it serves into its
+    own memory cache, whose size (TD_CACHE_SIZE) bounds its memory.
+    """
+
+    magic = b"PKMNSHM1"
+
+    # magic, slot count, arena size, write position
+    header = struct.Struct("<8sIQQ")
+
+    # key hash, record offset, record length, record crc, stored at
+    slot = struct.Struct("<QQIId")
+
+    # How many slots are looked at before giving up (or replacing the oldest)
+    probes = 8
+
+    def __init__(self, path: str, size: int = 64 * 1024 * 1024, slots: int = 4096, ttl: float = 300.0):
+
+        self.path = path
+        self.slots = slots
+        self.ttl = ttl
+
+        self.arena_start = self.header.size + slots * self.slot.size
+        self.arena_size = size - self.arena_start
+
+        if self.arena_size <= 0:
+            raise ValueError("Shared cache size is too small for its slots")
+
+        self.size = size
+        self._fd = None
+        self._map = None
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @classmethod
+    def from_env(cls) -> "SharedCache":
+        """
+        The shared cache is optional, it is only used if "TD_SHARED_CACHE_PATH"
+        is set (and the platform has file locks)
+        """
+
+        path = env_str("TD_SHARED_CACHE_PATH")
+
+        if path is None or fcntl is None:
+            return None
+
+        return cls(
+            path,
+            size = env_int("TD_SHARED_CACHE_SIZE_MB", 64) * 1024 * 1024,
+            slots = env_int("TD_SHARED_CACHE_SLOTS", 4096),
+            ttl = env_float("TD_SHARED_CACHE_TTL", env_float("TD_CACHE_TTL", 300.0)),
+        )
+
+    @contextmanager
+    def _locked(self):
+
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+        try:
+            yield
+
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def open(self):
+        """
+        Attach to the file, creating (or resetting, when its layout changed) it
+        """
+
+        if self._map is not None:
+            return
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        with self._locked():
+
+            current = os.fstat(self._fd).st_size
+            fresh = current != self.size
+
+            if fresh:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, self.size)
+
+            self._map = mmap.mmap(self._fd, self.size)
+
+            magic, slots, arena_size, _ = self.header.unpack_from(self._map, 0)
+
+            if fresh or magic != self.magic or slots != self.slots or arena_size != self.arena_size:
+                self._map[:self.arena_start] = bytes(self.arena_start)
+                self.header.pack_into(self._map, 0, self.magic, self.slots, self.arena_size, 0)
+
+    def close(self):
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    @staticmethod
+    def _hash(key: str) -> int:
+
+        # 0 marks an empty slot
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size = 8).digest(), "little") or 1
+
+    def _slot_offset(self, index: int) -> int:
+        return self.header.size + (index % self.slots) * self.slot.size
+
+    def get(self, key: str, max_age: float = None) -> bytes:
+        """
+        Raw payload of "key" or None when missing, expired (or stored more
+        than "max_age" seconds ago) or overwritten
+        """
+
+        key_hash = self._hash(key)
+        encoded_key = key.encode()
+        now = time()
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+
+        for probe in range(self.probes):
+
+            slot_hash, offset, length, crc, stored_at = self.slot.unpack_from(
+                self._map, self._slot_offset(key_hash + probe)
+            )
+
+            if slot_hash == 0:
+                break
+
+            if slot_hash != key_hash:
+                continue
+
+            if stored_at + ttl <= now or offset + length > self.arena_size:
+                break
+
+            # Copied before being checked, as a writer may overwrite it anytime
+            start = self.arena_start + offset
+            record = self._map[start:start + length]
+
+            if zlib.crc32(record) != crc:
+                break
+
+            key_length = int.from_bytes(record[:2], "little")
+
+            if record[2:2 + key_length] != encoded_key:
+                continue
+
+            self.hits += 1
+            return record[2 + key_length:]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, body: bytes):
+
+        encoded_key = key.encode()
+        record = len(encoded_key).to_bytes(2, "little") + encoded_key + body
+
+        # Too large to ever fit on the ring
+        if len(record) > self.arena_size:
+            return
+
+        key_hash = self._hash(key)
+        crc = zlib.crc32(record)
+
+        with self._locked():
+
+            magic, slots, arena_size, position = self.header.unpack_from(self._map, 0)
+
+            if position + len(record) > self.arena_size:
+                position = 0
+
+            start = self.arena_start + position
+            self._map[start:start + len(record)] = record
+
+            # Picks the slot of the same key, an empty one or the oldest one
+            target, oldest = None, None
+
+            for probe in range(self.probes):
+
+                index = self._slot_offset(key_hash + probe)
+                slot_hash, _, _, _, stored_at = self.slot.unpack_from(self._map, index)
+
+                if slot_hash in (0, key_hash):
+                    target = index
+                    break
+
+                if oldest is None or stored_at < oldest[1]:
+                    oldest = (index, stored_at)
+
+            if target is None:
+                target = oldest[0]
+
+            self.slot.pack_into(self._map, target, key_hash, position, len(record), crc, time())
+            self.header.pack_into(self._map, 0, magic, slots, arena_size, position + len(record))
+
+        self.writes += 1
+
+    def stats(self) -> dict:
+
+        return {
+            "path": self.path,
+            "size": self.size,
+            "slots": self.slots,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+        }
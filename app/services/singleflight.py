@@ -0,0 +1,65 @@
+## -- Importing External Modules -- ##
+import asyncio
+
+## -- Importing Internal Modules -- ##
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller of a key starts the call on its own task and every
+    caller arriving while it is in flight waits for that same task, getting
+    the same result or error. A cancelled caller only stops waiting, the call
+    keeps running for the others (and to fill the caches).
+    """
+
+    def __init__(self):
+
+        self._calls = {}
+
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key, func):
+        """
+        Await "func()" once for all of the concurrent callers of "key"
+        """
+
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(func())
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+            self._calls[key] = task
+            self.calls += 1
+
+        else:
+            self.coalesced += 1
+
+        # The shield keeps a cancelled caller from cancelling the shared task
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task: asyncio.Task):
+
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+        # Retrieving the exception avoids "never retrieved" warnings when
+        # every waiter has already gone away
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> dict:
+
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
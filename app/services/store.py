@@ -0,0 +1,290 @@
+## -- Importing External Modules -- ##
+from abc import ABC, abstractmethod
+from pathlib import Path
+from time import time
+import asyncio, os, sqlite3, threading, zlib
+
+## -- Importing Internal Modules -- ##
+from app.settings import env_str, env_float
+
+
+class BaseStore(ABC):
+    """
+    Shared behavior of the SQLite backed stores.
+
+    The database is only opened on first use and every access runs on a
+    worker thread, keeping both the startup and the event loop free.
+    """
+
+    def __init__(self, path: str):
+
+        self.path = path
+
+        self._conn = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @abstractmethod
+    def _connect(self) -> sqlite3.Connection:
+        """
+        The connection to the database, opened on first use
+        """
+
+    @abstractmethod
+    def _get(self, key: str) -> bytes:
+        """
+        Raw payload stored for "key" or None, on a worker thread
+        """
+
+    async def get(self, key: str) -> bytes:
+        """
+        Raw payload stored for "key" or None (failures count as a miss)
+        """
+
+        try:
+            body = await asyncio.to_thread(self._get, key)
+
+        except (sqlite3.Error, zlib.error):
+            self.errors += 1
+            body = None
+
+        if body is None:
+            self.misses += 1
+
+        else:
+            self.hits += 1
+
+        return body
+
+    def close(self):
+
+        with self._lock:
+
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+
+        return {
+            "path": self.path,
+            "open": self._conn is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+class PayloadStore(BaseStore):
+    """
+    Persistent SQLite store of raw (zlib compressed) PokeAPI payloads, so a
+    restarted server does not start cold.
+
+    It uses WAL journaling so several worker processes can read it at the
+    same time while one of them writes.
+    """
+
+    def __init__(self, path: str, ttl: float = 0):
+
+        super().__init__(path)
+
+        self.ttl = ttl
+        self.writes = 0
+
+    @classmethod
+    def from_env(cls) -> "PayloadStore":
+        """
+        The store is optional, it is only created if "TD_STORE_PATH" is set
+        """
+
+        path = env_str("TD_STORE_PATH")
+
+        if path is None:
+            return None
+
+        return cls(path, ttl = env_float("TD_STORE_TTL", 0))
+
+    def _connect(self) -> sqlite3.Connection:
+
+        if self._conn is None:
+
+            folder = os.path.dirname(self.path)
+
+            if folder:
+                os.makedirs(folder, exist_ok = True)
+
+            conn = sqlite3.connect(
+                self.path,
+                timeout = 5.0,
+                isolation_level = None,
+                check_same_thread = False,
+            )
+
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS payloads (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+
+            self._conn = conn
+
+        return self._conn
+
+    def _get(self, key: str) -> bytes:
+
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT body, stored_at FROM payloads WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        body, stored_at = row
+
+        if self.ttl and stored_at + self.ttl <= time():
+            return None
+
+        return zlib.decompress(body)
+
+    def _put(self, key: str, body: bytes):
+
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO payloads (key, body, stored_at) VALUES (?, ?, ?)",
+                (key, zlib.compress(body), time()),
+            )
+
+    async def put(self, key: str, body: bytes):
+
+        try:
+            await asyncio.to_thread(self._put, key, body)
+            self.writes += 1
+
+        except sqlite3.Error:
+            self.errors += 1
+
+    def stats(self) -> dict:
+
+        return {
+            **super().stats(),
+            "writes": self.writes,
+        }
+
+
+class SnapshotStore(BaseStore):
+    """
+    Read-only store built from a local PokeAPI dump (see
+    "tools/ingest_snapshot.py"), with every payload stored once and
+    indexed by both the pokemon id and name.
+    """
+
+    @classmethod
+    def from_env(cls) -> "SnapshotStore":
+        """
+        The snapshot is optional, it is only used if "TD_SNAPSHOT_PATH" is set
+        """
+
+        path = env_str("TD_SNAPSHOT_PATH")
+
+        if path is None:
+            return None
+
+        return cls(path)
+
+    @staticmethod
+    def create(path: str, documents) -> int:
+        """
+        Write the (id, name, raw payload) "documents" into a new snapshot at
+        "path", replacing any previous one at once. Returns how many
+        pokemon were stored.
+        """
+
+        temp_path = f"{path}.tmp"
+        folder = os.path.dirname(path)
+
+        if folder:
+            os.makedirs(folder, exist_ok = True)
+
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        conn = sqlite3.connect(temp_path)
+
+        try:
+            conn.execute(
+                """
+                CREATE TABLE pokemon (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE,
+                    body BLOB NOT NULL
+                )
+                """
+            )
+
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO pokemon (id, name, body) VALUES (?, ?, ?)",
+                    (
+                        (id, name, zlib.compress(body, 9))
+                        for id, name, body in documents
+                    ),
+                )
+
+            count = conn.execute("SELECT COUNT(*) FROM pokemon").fetchone()[0]
+            conn.execute("VACUUM")
+
+        finally:
+            conn.close()
+
+        # Servers already reading the old file keep their own copy of it
+        os.replace(temp_path, path)
+
+        return count
+
+    def _connect(self) -> sqlite3.Connection:
+
+        if self._conn is None:
+
+            self._conn = sqlite3.connect(
+                f"{Path(self.path).resolve().as_uri()}?mode=ro",
+                uri = True,
+                timeout = 5.0,
+                check_same_thread = False,
+            )
+
+        return self._conn
+
+    def _get(self, key: str) -> bytes:
+
+        if key.isdecimal():
+            query, value = "SELECT body FROM pokemon WHERE id = ?", int(key)
+
+        else:
+            query, value = "SELECT body FROM pokemon WHERE name = ?", key
+
+        with self._lock:
+            row = self._connect().execute(query, (value,)).fetchone()
+
+        return None if row is None else zlib.decompress(row[0])
+
+    def _pokemon(self) -> list:
+
+        with self._lock:
+            return self._connect().execute("SELECT id, name FROM pokemon").fetchall()
+
+    async def pokemon(self) -> list:
+        """
+        (id, name) of every pokemon on the snapshot
+        """
+
+        return await asyncio.to_thread(self._pokemon)
@@ -0,0 +1,123 @@
+## -- Importing External Modules -- ##
+from timeit import default_timer as timer
+from contextlib import contextmanager
+from contextvars import ContextVar
+from aiohttp import TraceConfig
+
+## -- Importing Internal Modules -- ##
+
+# Per request breakdown of where the time went, sent on the Server-Timing
+# header. The timing middleware starts it and the request path records its
+# phases; the tasks started by the request (like the upstream fetch) share
+# the same Timings through the context.
+
+
+class Timings:
+
+    __slots__ = ("start", "since", "phases")
+
+    def __init__(self):
+
+        self.start = timer()
+        self.since = self.start
+        self.phases = {}
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def mark(self, name: str):
+        """
+        Record the time since the request was admitted (see checkpoint) as
+        the phase "name"
+        """
+
+        self.phases[name] = timer() - self.since
+
+    def checkpoint(self):
+        """
+        The request got through the middlewares (rate limit, admission
+        queue), the next mark starts from here
+        """
+
+        self.since = timer()
+
+    def header(self, total: float) -> str:
+
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.3f}"
+            for name, seconds in (*self.phases.items(), ("total", total))
+        )
+
+
+current = ContextVar("timings", default = None)
+
+
+def start() -> Timings:
+
+    timings = Timings()
+    current.set(timings)
+
+    return timings
+
+
+def record(name: str, seconds: float):
+
+    timings = current.get()
+
+    if timings is not None:
+        timings.record(name, seconds)
+
+
+def mark(name: str):
+
+    timings = current.get()
+
+    if timings is not None:
+        timings.mark(name)
+
+
+def checkpoint():
+
+    timings = current.get()
+
+    if timings is not None:
+        timings.checkpoint()
+
+
+@contextmanager
+def phase(name: str):
+
+    start_time = timer()
+
+    try:
+        yield
+
+    finally:
+        record(name, timer() - start_time)
+
+
+def trace_config() -> TraceConfig:
+    """
+    aiohttp tracing of the time waiting for a pooled connection ("pool") and
+    opening a new one, DNS and TLS included ("connect")
+    """
+
+    async def on_queued_start(session, context, params):
+        context.queued_at = timer()
+
+    async def on_queued_end(session, context, params):
+        record("pool", timer() - context.queued_at)
+
+    async def on_create_start(session, context, params):
+        context.created_at = timer()
+
+    async def on_create_end(session, context, params):
+        record("connect", timer() - context.created_at)
+
+    config = TraceConfig()
+    config.on_connection_queued_start.append(on_queued_start)
+    config.on_connection_queued_end.append(on_queued_end)
+    config.on_connection_create_start.append(on_create_start)
+    config.on_connection_create_end.append(on_create_end)
+
+    return config
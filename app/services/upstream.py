@@ -0,0 +1,223 @@
+## -- Importing External Modules -- ##
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from timeit import default_timer as timer
+import asyncio, random
+
+## -- Importing Internal Modules -- ##
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services import metrics, timing
+from app.settings import env_int, env_float, env_str
+
+# Upstream answers worth another try (the requests are idempotent GETs)
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class UpstreamClient:
+    """
+    App-wide pooled HTTP client used to talk with the PokeAPI.
+
+    A single session (and so a single connection pool, with keep-alive and
+    DNS cache) is created on startup and shared by every route.
+
+    Every attempt has connect, read and total timeouts, transient failures
+    are retried a few times with jittered exponential backoff (all of the
+    attempts and waits within a "deadline") and a circuit breaker stops
+    calling the PokeAPI while it keeps failing.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://pokeapi.co",
+        limit: int = 100,
+        limit_per_host: int = 30,
+        keepalive_timeout: float = 30.0,
+        dns_ttl: int = 300,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 5.0,
+        attempt_timeout: float = 8.0,
+        deadline: float = 10.0,
+        retries: int = 2,
+        backoff: float = 0.1,
+        max_backoff: float = 1.0,
+        breaker: CircuitBreaker = None,
+    ):
+
+        self.base_url = base_url
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = None
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+
+    @classmethod
+    def from_env(cls) -> "UpstreamClient":
+
+        return cls(
+            base_url = env_str("TD_UPSTREAM_URL", "https://pokeapi.co"),
+            limit = env_int("TD_UPSTREAM_LIMIT", 100),
+            limit_per_host = env_int("TD_UPSTREAM_LIMIT_PER_HOST", 30),
+            keepalive_timeout = env_float("TD_UPSTREAM_KEEPALIVE", 30.0),
+            dns_ttl = env_int("TD_UPSTREAM_DNS_TTL", 300),
+            connect_timeout = env_float("TD_UPSTREAM_CONNECT_TIMEOUT", 2.0),
+            read_timeout = env_float("TD_UPSTREAM_READ_TIMEOUT", 5.0),
+            attempt_timeout = env_float("TD_UPSTREAM_ATTEMPT_TIMEOUT", 8.0),
+            deadline = env_float("TD_UPSTREAM_DEADLINE", 10.0),
+            retries = env_int("TD_UPSTREAM_RETRIES", 2),
+            backoff = env_float("TD_UPSTREAM_BACKOFF", 0.1),
+            breaker = CircuitBreaker.from_env(),
+        )
+
+    async def start(self):
+
+        if self.session is not None:
+            return
+
+        connector = TCPConnector(
+            limit = self.limit,
+            limit_per_host = self.limit_per_host,
+            keepalive_timeout = self.keepalive_timeout,
+            use_dns_cache = True,
+            ttl_dns_cache = self.dns_ttl,
+        )
+
+        # "total" bounds a whole attempt, as a body trickling in never
+        # trips the read timeout
+        timeout = ClientTimeout(
+            total = self.attempt_timeout,
+            sock_connect = self.connect_timeout,
+            sock_read = self.read_timeout,
+        )
+
+        self.session = ClientSession(
+            self.base_url,
+            connector = connector,
+            timeout = timeout,
+            trace_configs = [timing.trace_config()],
+        )
+
+    async def close(self):
+
+        if self.session is None:
+            return
+
+        await self.session.close()
+        self.session = None
+
+    async def fetch(self, url: str) -> tuple:
+        """
+        GET the url (relative to the base url) returning (status, raw body)
+
+        Raises CircuitOpenError without calling the PokeAPI while it is
+        unhealthy, the last aiohttp/timeout error if every try fails and a
+        timeout error once the tries (and the waits between them) take
+        longer than the deadline.
+        """
+
+        try:
+            self.breaker.before_call()
+
+        except CircuitOpenError:
+            metrics.UPSTREAM_ERRORS.labels("circuit_open").inc()
+            raise
+
+        start_time = timer()
+
+        try:
+            with timing.phase("upstream"):
+                status, body = await asyncio.wait_for(self.fetch_with_retries(url), self.deadline)
+
+        except asyncio.TimeoutError:
+            self.record_failure("timeout", start_time)
+            raise
+
+        except ClientError:
+            self.record_failure("connection", start_time)
+            raise
+
+        except BaseException:
+            self.breaker.release()
+            raise
+
+        metrics.UPSTREAM_LATENCY.labels(str(status)).observe(timer() - start_time)
+
+        if status >= 500:
+            self.failures += 1
+            self.breaker.record_failure()
+            metrics.UPSTREAM_ERRORS.labels("status").inc()
+
+        else:
+            self.breaker.record_success()
+
+        return status, body
+
+    def record_failure(self, kind: str, start_time: float):
+
+        self.failures += 1
+        self.breaker.record_failure()
+
+        metrics.UPSTREAM_LATENCY.labels(kind).observe(timer() - start_time)
+        metrics.UPSTREAM_ERRORS.labels(kind).inc()
+
+    async def fetch_with_retries(self, url: str) -> tuple:
+
+        attempt = 0
+
+        while True:
+
+            self.requests += 1
+
+            try:
+                async with self.session.get(url) as response:
+                    status, body = response.status, await response.read()
+
+                if status not in RETRY_STATUSES or attempt >= self.retries:
+                    return status, body
+
+            except (ClientError, asyncio.TimeoutError):
+
+                if attempt >= self.retries:
+                    raise
+
+            # "Full jitter" backoff, spreading the retries of many clients
+            delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0, delay))
+
+            attempt += 1
+            self.retried += 1
+
+    def pool_stats(self) -> dict:
+
+        stats = {
+            "open": self.session is not None,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "requests": self.requests,
+            "retried": self.retried,
+            "failures": self.failures,
+            "in_use": 0,
+            "idle": 0,
+        }
+
+        if self.session is None:
+            return stats
+
+        # aiohttp does not expose the pool usage publicly
+        connector = self.session.connector
+        stats["in_use"] = len(getattr(connector, "_acquired", ()))
+        stats["idle"] = sum(
+            len(conns) for conns in getattr(connector, "_conns", {}).values()
+        )
+
+        return stats
@@ -0,0 +1,38 @@
+## -- Importing External Modules -- ##
+import os
+
+## -- Importing Internal Modules -- ##
+
+# Helpers to read the "TD_*" variables loaded from "config/.env".
+# Empty or missing values fall back to the given default.
+
+def env_str(name: str, default: str = None) -> str:
+
+    value = os.environ.get(name)
+
+    if value is None or not value.strip():
+        return default
+
+    return value.strip()
+
+
+def env_int(name: str, default: int = None) -> int:
+
+    value = env_str(name)
+    return int(value) if value is not None else default
+
+
+def env_float(name: str, default: float = None) -> float:
+
+    value = env_str(name)
+    return float(value) if value is not None else default
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+
+    value = env_str(name)
+
+    if value is None:
+        return default
+
+    return value.lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,13 @@
+## -- Importing External Modules -- ##
+from uvicorn.workers import UvicornWorker
+
+## -- Importing Internal Modules -- ##
+
+
+class TunedUvicornWorker(UvicornWorker):
+    """
+    Gunicorn worker running the api on uvicorn, with the event loop and http
+    parser set by "main.py" (gunicorn only takes worker classes by path)
+    """
+
+    CONFIG_KWARGS = {"loop": "auto", "http": "auto"}
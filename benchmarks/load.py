@@ -0,0 +1,375 @@
+## -- Importing External Modules -- ##
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from datetime import datetime, timezone
+from pathlib import Path
+from timeit import default_timer as timer
+import argparse, asyncio, itertools, json, os, platform, socket, subprocess, sys, tempfile
+
+description = """
+Load benchmark of the api: starts it (with main.py) against a local fake
+PokeAPI (tools.fake_pokeapi), drives each scenario with "concurrency"
+clients for "duration" seconds and reports requests/sec and latency
+percentiles, also written to a json file so runs can be compared.
+"""
+
+# Keys already cached before a warm scenario is measured
+WARM_KEYS = 50
+BATCH_SIZE = 20
+
+# Pokemon on the fake PokeAPI
+POKEMON = 10000
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def get_pokemon(index: int) -> tuple:
+    return "GET", f"/pokemon/{index % WARM_KEYS + 1}", None
+
+def post_pokemon(index: int) -> tuple:
+    return "POST", "/pokemon", {"name": f"pokemon-{index % WARM_KEYS + 1}"}
+
+def get_fields(index: int) -> tuple:
+    return "GET", f"/pokemon/{index % WARM_KEYS + 1}?fields=name,types", None
+
+def get_unseen(index: int) -> tuple:
+    # Past the warm keys, every request is for a pokemon never asked before
+    # (until all of them were)
+    return "GET", f"/pokemon/{WARM_KEYS + index % (POKEMON - WARM_KEYS) + 1}", None
+
+def post_batch(index: int) -> tuple:
+    return "POST", "/pokemon/batch", {"pokemon": [(index + offset) % WARM_KEYS + 1 for offset in range(BATCH_SIZE)]}
+
+def get_missing(index: int) -> tuple:
+    return "GET", f"/pokemon/missingno-{index}", None
+
+def get_missing_again(index: int) -> tuple:
+    return "GET", f"/pokemon/missingno-{index % WARM_KEYS}", None
+
+# name: (request of the index-th call, warm the cache first, description)
+SCENARIOS = {
+    "cold": (get_unseen, False, "GET of pokemon never asked before (upstream call every time)"),
+    "warm": (post_pokemon, True, "POST /pokemon of cached pokemon"),
+    "large_payload": (get_pokemon, True, "GET of cached pokemon, whole payload"),
+    "small_payload": (get_fields, True, "GET of cached pokemon, only ?fields=name,types"),
+    "batch": (post_batch, True, f"POST /pokemon/batch of {BATCH_SIZE} cached pokemon"),
+    "not_found": (get_missing, False, "GET of pokemon the upstream does not know (404)"),
+    "not_found_again": (get_missing_again, False, "GET of the same few pokemon the upstream does not know (404)"),
+}
+
+
+def free_port() -> int:
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def commit() -> str:
+    """
+    Commit being measured, None outside of a git checkout
+    """
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output = True, text = True, check = True,
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def start_process(command: list, env: dict, log: Path) -> subprocess.Popen:
+
+    with open(log, "wb") as output:
+        return subprocess.Popen(command, env = {**os.environ, **env}, stdout = output, stderr = subprocess.STDOUT)
+
+def stop_process(process: subprocess.Popen):
+
+    process.terminate()
+
+    try:
+        process.wait(timeout = 10)
+
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+async def wait_ready(session: ClientSession, url: str, process: subprocess.Popen, log: Path, timeout: float = 30):
+
+    deadline = timer() + timeout
+
+    while timer() < deadline:
+
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with {process.returncode}, see {log}")
+
+        try:
+            async with session.get(url) as response:
+                if response.status < 500:
+                    return
+
+        except ClientError:
+            pass
+
+        await asyncio.sleep(0.2)
+
+    raise RuntimeError(f"{url} did not start in {timeout} seconds, see {log}")
+
+async def wait_names(session: ClientSession, url: str, timeout: float = 30):
+    """
+    Wait for the api to load its name index, so every run starts the same
+    """
+
+    deadline = timer() + timeout
+
+    while timer() < deadline:
+
+        async with session.get(url) as response:
+            names = (await response.json())["data"].get("names")
+
+        if not names or names["loaded"]:
+            return
+
+        await asyncio.sleep(0.2)
+
+    raise RuntimeError(f"The api did not load the pokemon names in {timeout} seconds")
+
+
+def percentile(ordered: list, q: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+
+    if not ordered:
+        return None
+
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+def summarize(latencies: list, statuses: dict, elapsed: float) -> dict:
+
+    ordered = sorted(latencies)
+    milliseconds = lambda value: None if value is None else round(value * 1000, 3)
+
+    return {
+        "requests": len(ordered),
+        "errors": sum(count for status, count in statuses.items() if not 200 <= int(status) < 500),
+        "statuses": statuses,
+        "elapsed": round(elapsed, 3),
+        "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": milliseconds(sum(ordered) / len(ordered) if ordered else None),
+            "p50": milliseconds(percentile(ordered, 50)),
+            "p95": milliseconds(percentile(ordered, 95)),
+            "p99": milliseconds(percentile(ordered, 99)),
+            "max": milliseconds(ordered[-1] if ordered else None),
+        },
+    }
+
+
+async def call(session: ClientSession, base_url: str, request: tuple) -> int:
+    """
+    Make the request reading the whole body, returns the status (0 on errors)
+    """
+
+    method, path, body = request
+
+    try:
+        async with session.request(method, base_url + path, json = body) as response:
+            await response.read()
+            return response.status
+
+    except (ClientError, asyncio.TimeoutError):
+        return 0
+
+async def run_scenario(session: ClientSession, base_url: str, name: str, concurrency: int, duration: float) -> dict:
+
+    make_request, warm, _ = SCENARIOS[name]
+
+    if warm:
+        for index in range(WARM_KEYS):
+            await call(session, base_url, get_pokemon(index))
+
+    counter = itertools.count()
+    latencies = []
+    statuses = {}
+
+    async def client(deadline: float):
+
+        while timer() < deadline:
+
+            request = make_request(next(counter))
+
+            start_time = timer()
+            status = await call(session, base_url, request)
+            latencies.append(timer() - start_time)
+
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    start_time = timer()
+    await asyncio.gather(*(client(start_time + duration) for _ in range(concurrency)))
+
+    return summarize(latencies, statuses, timer() - start_time)
+
+
+async def run(args, base_url: str) -> dict:
+
+    connector = TCPConnector(limit = args.concurrency)
+    timeout = ClientTimeout(total = 30)
+    headers = {"Accept-Encoding": args.accept_encoding}
+
+    # Bodies are read as they come, decompressing would measure the client
+    async with ClientSession(connector = connector, timeout = timeout, headers = headers, auto_decompress = False) as session:
+
+        results = {}
+
+        for name in args.scenarios:
+
+            results[name] = await run_scenario(session, base_url, name, args.concurrency, args.duration)
+            print_result(name, results[name], args.baseline)
+
+        return results
+
+
+def print_result(name: str, result: dict, baseline: dict = None):
+
+    latency = result["latency_ms"]
+    line = (
+        f"{name:<14} {result['rps']:>9.1f} req/s  "
+        f"p50 {latency['p50'] or 0:>8.2f} ms  p95 {latency['p95'] or 0:>8.2f} ms  p99 {latency['p99'] or 0:>8.2f} ms  "
+        f"errors {result['errors']}"
+    )
+
+    previous = (baseline or {}).get("scenarios", {}).get(name)
+
+    if previous and previous["rps"] and previous["latency_ms"]["p99"]:
+        rps = (result["rps"] / previous["rps"] - 1) * 100
+        p99 = ((latency["p99"] or 0) / previous["latency_ms"]["p99"] - 1) * 100
+        line += f"  (vs baseline: {rps:+.1f}% req/s, {p99:+.1f}% p99)"
+
+    print(line, flush = True)
+
+
+async def start_and_run(args, folder: Path) -> dict:
+
+    upstream_port, api_port = free_port(), free_port()
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+    base_url = f"http://127.0.0.1:{api_port}"
+
+    upstream_log, api_log = folder / "upstream.log", folder / "api.log"
+
+    upstream = start_process(
+        [
+            sys.executable, "-m", "tools.fake_pokeapi",
+            "--port", str(upstream_port),
+            "--count", str(POKEMON),
+            "--moves", str(args.moves),
+            "--latency", args.upstream_latency,
+        ],
+        {},
+        upstream_log,
+    )
+
+    api = start_process(
+        [sys.executable, "main.py"],
+        {
+            "TD_HOST": "127.0.0.1",
+            "TD_PORT": str(api_port),
+            "TD_WORKERS": str(args.workers),
+            "TD_UPSTREAM_URL": upstream_url,
+            "TD_UPSTREAM_LIMIT_PER_HOST": str(max(args.concurrency, 30)),
+            # Measure the api, not its protections
+            "TD_RATE_LIMIT": "0",
+            "TD_MAX_IN_FLIGHT": "0",
+            "TD_TIMING_LOG": "false",
+            **dict(setting.split("=", 1) for setting in args.env),
+        },
+        api_log,
+    )
+
+    try:
+
+        async with ClientSession() as session:
+            await wait_ready(session, f"{upstream_url}/api/v2/pokemon/1", upstream, upstream_log)
+            await wait_ready(session, f"{base_url}/status", api, api_log)
+            await wait_names(session, f"{base_url}/status")
+
+        return await run(args, base_url)
+
+    finally:
+        stop_process(api)
+        stop_process(upstream)
+
+
+def main(argv: list = None) -> int:
+
+    parser = argparse.ArgumentParser(description = description)
+    parser.add_argument("--concurrency", type = int, default = 32, help = "Clients making requests at once (default: 32)")
+    parser.add_argument("--duration", type = float, default = 10, help = "Seconds each scenario runs (default: 10)")
+    parser.add_argument("--workers", type = int, default = 1, help = "TD_WORKERS of the api (default: 1)")
+    parser.add_argument("--moves", type = int, default = 100, help = "Moves on each upstream payload (default: 100)")
+    parser.add_argument("--upstream-latency", default = "20", help = "Latency in ms of the fake PokeAPI, see tools.fake_pokeapi --latency (default: 20)")
+    parser.add_argument("--accept-encoding", default = "gzip, br", help = "Accept-Encoding of the requests (default: \"gzip, br\")")
+    parser.add_argument("--scenario", dest = "scenarios", action = "append", choices = list(SCENARIOS), help = "Scenario to run, can be repeated (default: all)")
+    parser.add_argument("--env", action = "append", default = [], metavar = "NAME=VALUE", help = "Extra env variable of the api, can be repeated")
+    parser.add_argument("--output", type = Path, help = "Json file of the results (default: benchmarks/results/load-<commit>-<time>.json)")
+    parser.add_argument("--baseline", type = Path, help = "Json file of a previous run to compare with")
+    args = parser.parse_args(argv)
+
+    args.scenarios = args.scenarios or list(SCENARIOS)
+
+    for setting in args.env:
+        if "=" not in setting:
+            parser.error(f"--env {setting} is not NAME=VALUE")
+
+    if args.baseline:
+        args.baseline = json.loads(args.baseline.read_text())
+
+    revision = commit()
+    started_at = datetime.now(timezone.utc)
+
+    print(f"commit {revision}, {args.concurrency} clients, {args.duration:g}s per scenario, {args.workers} worker(s)")
+
+    with tempfile.TemporaryDirectory(prefix = "pokemon_api_load_") as folder:
+
+        try:
+            results = asyncio.run(start_and_run(args, Path(folder)))
+
+        except RuntimeError as error:
+            print(error, file = sys.stderr)
+
+            for log in Path(folder).glob("*.log"):
+                print(f"--- {log.name}\n{log.read_text(errors = 'replace')}", file = sys.stderr)
+
+            return 1
+
+    report = {
+        "benchmark": "load",
+        "commit": revision,
+        "started_at": started_at.isoformat(timespec = "seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "workers": args.workers,
+            "moves": args.moves,
+            "upstream_latency": args.upstream_latency,
+            "accept_encoding": args.accept_encoding,
+            "env": args.env,
+        },
+        "scenarios": {
+            name: {"description": SCENARIOS[name][2], **result}
+            for name, result in results.items()
+        },
+    }
+
+    output = args.output or RESULTS_DIR / f"load-{revision or 'local'}-{started_at:%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents = True, exist_ok = True)
+    output.write_text(json.dumps(report, indent = 2))
+
+    print(f"Results written to {output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+## -- Importing External Modules -- ##
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from time import process_time
+import argparse, json, sys
+
+## -- Importing Internal Modules -- ##
+from app.services.entry import PokemonEntry
+from tools.fake_pokeapi import synthetic_payload
+
+description = """
+Microbenchmark of the CPU time spent per request to turn an upstream
+payload into the response body: the previous path (decode, envelope,
+jsonable_encoder, JSONResponse) against the current one (a cached
+PokemonEntry splicing the raw upstream bytes into the envelope).
+"""
+
+def previous_path(raw: bytes) -> bytes:
+
+    data = json.loads(raw)
+
+    rtn_data = {
+        "status": "success",
+        "message": "Pokemon info was found.",
+        "data": {
+            "name": data.get("name").capitalize(),
+            "info": data,
+        },
+    }
+
+    return JSONResponse(status_code = 200, content = jsonable_encoder(rtn_data)).body
+
+
+def current_path(entry: PokemonEntry) -> bytes:
+    return Response(status_code = 200, content = entry.body(), media_type = "application/json").body
+
+
+def current_miss_path(raw: bytes) -> bytes:
+    """
+    The current path when the entry is not cached yet (decoded once)
+    """
+
+    return current_path(PokemonEntry("gholdengo", raw, json.loads(raw)))
+
+
+def measure(func, arg, rounds: int) -> float:
+    """
+    CPU milliseconds per call
+    """
+
+    start = process_time()
+
+    for _ in range(rounds):
+        func(arg)
+
+    return (process_time() - start) / rounds * 1000
+
+
+def main(argv: list = None) -> int:
+
+    parser = argparse.ArgumentParser(description = description)
+    parser.add_argument("--moves", type = int, default = 100, help = "Moves on the payload (default: 100)")
+    parser.add_argument("--rounds", type = int, default = 200, help = "Requests measured per path (default: 200)")
+    args = parser.parse_args(argv)
+
+    raw = synthetic_payload(1000, "gholdengo", args.moves)
+    entry = PokemonEntry("gholdengo", raw, json.loads(raw))
+
+    # Same bytes on both paths, only the way of getting there changes
+    assert json.loads(previous_path(raw)) == json.loads(current_path(entry))
+
+    before = measure(previous_path, raw, args.rounds)
+    after_miss = measure(current_miss_path, raw, args.rounds)
+    after = measure(current_path, entry, args.rounds)
+
+    print(f"payload:      {len(raw) / 1024:.1f} KiB, rounds: {args.rounds}")
+    print(f"before:       {before:.3f} ms CPU per request")
+    print(f"after (miss): {after_miss:.3f} ms CPU per request ({before / max(after_miss, 1e-9):.1f}x less)")
+    print(f"after (hit):  {after:.3f} ms CPU per request ({before / max(after, 1e-9):.0f}x less)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+## -- Importing External Modules -- ##
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from timeit import default_timer as timer
+import argparse, json, platform, subprocess, sys, tempfile, time, urllib.error, urllib.request
+
+## -- Importing Internal Modules -- ##
+from benchmarks.load import RESULTS_DIR, commit, free_port, start_process, stop_process
+
+description = """
+Startup benchmark of a fresh worker: the time to import the app, to
+answer its first request and the first and next /openapi.json (behind
+/docs), with the OpenAPI document generated on first use and prebuilt
+(tools.build_openapi, TD_OPENAPI_PATH).
+"""
+
+IMPORT_CODE = """
+from timeit import default_timer as timer
+start_time = timer()
+import app.routing
+print(timer() - start_time)
+"""
+
+
+def import_time() -> float:
+    """
+    Seconds a new interpreter takes to import the app
+    """
+
+    output = subprocess.run([sys.executable, "-c", IMPORT_CODE], capture_output = True, text = True, check = True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+def get(url: str) -> float:
+    """
+    Seconds taken by a GET of the url, reading the whole body
+    """
+
+    start_time = timer()
+
+    with urllib.request.urlopen(url, timeout = 30) as response:
+        response.read()
+
+    return timer() - start_time
+
+def fresh_worker(env: dict, log: Path, timeout: float = 30) -> dict:
+    """
+    Start the api and time its first requests (seconds)
+    """
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    start_time = timer()
+    api = start_process(
+        [sys.executable, "main.py"],
+        {"TD_HOST": "127.0.0.1", "TD_PORT": str(port), "TD_WORKERS": "1", **env},
+        log,
+    )
+
+    try:
+
+        while True:
+
+            if api.poll() is not None or timer() - start_time > timeout:
+                raise RuntimeError(f"The api did not start, see {log}")
+
+            try:
+                get(f"{base_url}/status")
+                break
+
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+
+        ready = timer() - start_time
+
+        return {
+            "ready": ready,
+            "first_openapi": get(f"{base_url}/openapi.json"),
+            "next_openapi": get(f"{base_url}/openapi.json"),
+            "docs": get(f"{base_url}/docs"),
+        }
+
+    finally:
+        stop_process(api)
+
+
+def main(argv: list = None) -> int:
+
+    parser = argparse.ArgumentParser(description = description)
+    parser.add_argument("--rounds", type = int, default = 5, help = "Fresh interpreters/workers per measure, the median is kept (default: 5)")
+    parser.add_argument("--output", type = Path, help = "Json file of the results (default: benchmarks/results/startup-<commit>-<time>.json)")
+    args = parser.parse_args(argv)
+
+    revision = commit()
+    started_at = datetime.now(timezone.utc)
+    milliseconds = lambda values: round(median(values) * 1000, 2)
+
+    with tempfile.TemporaryDirectory(prefix = "pokemon_api_startup_") as folder:
+
+        prebuilt = Path(folder) / "openapi.json"
+        subprocess.run([sys.executable, "-m", "tools.build_openapi", str(prebuilt)], check = True, capture_output = True)
+
+        results = {"import": milliseconds([import_time() for _ in range(args.rounds)])}
+        print(f"import app:          {results['import']:>8.2f} ms")
+
+        for mode, openapi_path in (("generated", ""), ("prebuilt", str(prebuilt))):
+
+            try:
+                rounds = [
+                    fresh_worker({"TD_OPENAPI_PATH": openapi_path}, Path(folder) / "api.log")
+                    for _ in range(args.rounds)
+                ]
+
+            except RuntimeError as error:
+                print(error, file = sys.stderr)
+                print((Path(folder) / "api.log").read_text(errors = "replace"), file = sys.stderr)
+                return 1
+
+            results[mode] = {key: milliseconds([sample[key] for sample in rounds]) for key in rounds[0]}
+
+            print(
+                f"{mode + ':':<20} ready {results[mode]['ready']:>8.2f} ms, "
+                f"first /openapi.json {results[mode]['first_openapi']:>7.2f} ms, "
+                f"next {results[mode]['next_openapi']:>6.2f} ms, /docs {results[mode]['docs']:>6.2f} ms"
+            )
+
+    report = {
+        "benchmark": "startup",
+        "commit": revision,
+        "started_at": started_at.isoformat(timespec = "seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"rounds": args.rounds},
+        "results_ms": results,
+    }
+
+    output = args.output or RESULTS_DIR / f"startup-{revision or 'local'}-{started_at:%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents = True, exist_ok = True)
+    output.write_text(json.dumps(report, indent = 2))
+
+    print(f"Results written to {output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
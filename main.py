@@ -1,12 +1,159 @@
 ## -- Importing External Modules -- ##
-import uvicorn, os
+from dotenv import load_dotenv
+import importlib.util, logging, os, shutil, tempfile, uvicorn
 
 ## -- Importing Internal Modules -- ##
-from app.routing import app
+from app.settings import env_int, env_str
+
+logger = logging.getLogger("pokemon_api")
+
+def installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def server_config() -> dict:
+    """
+    Effective server configuration, from the "TD_*" env variables
+    """
+
+    loop = env_str("TD_LOOP", "auto")
+
+    if loop == "auto":
+        loop = "uvloop" if installed("uvloop") else "asyncio"
+
+    http = env_str("TD_HTTP", "auto")
+
+    if http == "auto":
+        http = "httptools" if installed("httptools") else "h11"
+
+    # 0 workers means one per cpu
+    workers = env_int("TD_WORKERS", 1)
+
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    return {
+        "host": env_str("TD_HOST", "0.0.0.0"),
+        "port": int(os.environ.get("TD_PORT")),
+        "workers": workers,
+        "loop": loop,
+        "http": http,
+        "backlog": env_int("TD_BACKLOG", 2048),
+        "keepalive_timeout": env_int("TD_KEEPALIVE_TIMEOUT", 5),
+        "max_requests": env_int("TD_MAX_REQUESTS", 0),
+        "graceful_timeout": env_int("TD_GRACEFUL_TIMEOUT", 30),
+    }
+
+def prepare_metrics_dir():
+    """
+    Folder where every worker keeps its metrics, so /metrics can sum them up.
+    It has to be set before the metrics are imported (by the app)
+    """
+
+    folder = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+    if folder is None:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix = "pokemon_api_metrics_")
+
+    else:
+        # Values of a previous run would be summed up too
+        shutil.rmtree(folder, ignore_errors = True)
+        os.makedirs(folder, exist_ok = True)
+
+def worker_exited(server, worker):
+
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+def run_gunicorn(config: dict):
+    """
+    Production serving: gunicorn supervising uvicorn workers, restarting
+    the ones that die or reach "max_requests"
+    """
+
+    from gunicorn.app.base import BaseApplication
+    from app.workers import TunedUvicornWorker
+
+    # Set before forking, so every worker gets it
+    TunedUvicornWorker.CONFIG_KWARGS = {"loop": config["loop"], "http": config["http"]}
+
+    options = {
+        "bind": f"{config['host']}:{config['port']}",
+        "workers": config["workers"],
+        "worker_class": "app.workers.TunedUvicornWorker",
+        "backlog": config["backlog"],
+        "keepalive": config["keepalive_timeout"],
+        "max_requests": config["max_requests"],
+        # Spreads the restarts so the workers do not recycle all at once
+        "max_requests_jitter": config["max_requests"] // 10,
+        "graceful_timeout": config["graceful_timeout"],
+        "child_exit": worker_exited,
+    }
+
+    class Server(BaseApplication):
+
+        def load_config(self):
+
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+
+            from app.routing import app
+            return app
+
+    Server().run()
+
+def run_uvicorn(config: dict):
+
+    from app.routing import app
+
+    options = {
+        "host": config["host"],
+        "port": config["port"],
+        "loop": config["loop"],
+        "http": config["http"],
+        "backlog": config["backlog"],
+        "timeout_keep_alive": config["keepalive_timeout"],
+    }
+
+    if config["workers"] == 1:
+        uvicorn.run(app, **options)
+
+    else:
+        uvicorn.run("app.routing:app", workers = config["workers"], **options)
 
 def main():
-    port = int(os.environ.get("TD_PORT"))
-    uvicorn.run(app, host = "0.0.0.0", port = port)
+
+    logging.basicConfig(level = logging.INFO, format = "%(levelname)s:     %(message)s")
+    load_dotenv("./config/.env")
+
+    config = server_config()
+    # gunicorn needs fcntl, missing on Windows even where gunicorn is installed
+    server = "gunicorn" if config["workers"] > 1 and installed("gunicorn") and installed("fcntl") else "uvicorn"
+
+    if config["workers"] > 1:
+        prepare_metrics_dir()
+
+    if server == "uvicorn":
+
+        # uvicorn alone would stop the workers for good after max_requests
+        # (never replacing them) and has no graceful timeout to apply
+        if config.pop("max_requests"):
+            logger.warning("TD_MAX_REQUESTS is ignored, workers are only replaced after it with gunicorn (TD_WORKERS > 1)")
+
+        config.pop("graceful_timeout")
+
+    logger.info(
+        "Serving with %s: %s",
+        server,
+        ", ".join(f"{key}={value}" for key, value in config.items()),
+    )
+
+    if server == "gunicorn":
+        run_gunicorn(config)
+
+    else:
+        run_uvicorn(config)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
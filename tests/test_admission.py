@@ -0,0 +1,163 @@
+## -- Importing External Modules -- ##
+import asyncio
+
+## -- Importing Internal Modules -- ##
+from app.middlewares.admission import AdmissionController
+
+
+async def settle():
+    """
+    Let the waiting tasks run until they block again
+    """
+
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_admits_up_to_max_in_flight():
+
+    async def scenario():
+
+        controller = AdmissionController(max_in_flight = 2, max_queue = 0)
+
+        assert await controller.acquire()
+        assert await controller.acquire()
+        assert not await controller.acquire()
+
+        assert controller.in_flight == 2
+        assert controller.shed == 1
+
+    asyncio.run(scenario())
+
+
+def test_release_hands_the_slot_over_in_order():
+
+    async def scenario():
+
+        controller = AdmissionController(max_in_flight = 1, max_queue = 2)
+        await controller.acquire()
+
+        first = asyncio.ensure_future(controller.acquire())
+        await settle()
+        second = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        assert controller.stats()["waiting"] == 2
+
+        controller.release()
+        await settle()
+
+        assert first.done() and first.result()
+        assert not second.done()
+        assert controller.in_flight == 1
+
+        controller.release()
+        await settle()
+
+        assert second.result()
+
+        controller.release()
+
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_sheds_when_the_queue_is_full():
+
+    async def scenario():
+
+        controller = AdmissionController(max_in_flight = 1, max_queue = 1)
+        await controller.acquire()
+
+        waiting = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        assert not await controller.acquire()
+        assert controller.shed == 1
+
+        controller.release()
+        assert await waiting
+
+    asyncio.run(scenario())
+
+
+def test_wait_times_out():
+
+    async def scenario():
+
+        controller = AdmissionController(max_in_flight = 1, max_queue = 1, queue_timeout = 0.01)
+        await controller.acquire()
+
+        assert not await controller.acquire()
+        assert controller.timed_out == 1
+        assert controller.stats()["waiting"] == 0
+
+        # The slot is not handed over to the request that gave up
+        controller.release()
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+
+    async def scenario():
+
+        controller = AdmissionController(max_in_flight = 1, max_queue = 2)
+        await controller.acquire()
+
+        waiting = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        waiting.cancel()
+        await settle()
+
+        assert waiting.cancelled()
+        assert controller.stats()["waiting"] == 0
+
+        controller.release()
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_to_a_cancelled_waiter_goes_to_the_next():
+
+    async def scenario():
+
+        controller = AdmissionController(max_in_flight = 1, max_queue = 2)
+        await controller.acquire()
+
+        first = asyncio.ensure_future(controller.acquire())
+        await settle()
+        second = asyncio.ensure_future(controller.acquire())
+        await settle()
+
+        # Cancelled after getting the slot but before running again
+        controller.release()
+        first.cancel()
+        await settle()
+
+        # Either the cancellation wins and the slot goes on to the next
+        # waiter, or the slot does (the cancellation came too late), but
+        # it is never lost
+        holders = [
+            task for task in (first, second)
+            if task.done() and not task.cancelled() and task.result()
+        ]
+
+        assert len(holders) == 1
+        assert controller.in_flight == 1
+
+        controller.release()
+        await settle()
+
+        # Then the next waiter only gets it once the first one is done
+        if holders[0] is first:
+            assert second.result()
+            controller.release()
+
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,95 @@
+## -- Importing External Modules -- ##
+
+## -- Importing Internal Modules -- ##
+from app.services.cache import TTLCache, FRESH, STALE, EXPIRED
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_fresh_then_stale_then_expired_on_grace():
+
+    clock = Clock()
+    cache = TTLCache(maxsize = 4, ttl = 10, soft_ttl = 5, grace = 20, clock = clock)
+    cache.set("25", "pikachu")
+
+    assert cache.lookup("25") == ("pikachu", FRESH)
+
+    clock.now += 5
+    assert cache.lookup("25") == ("pikachu", STALE)
+    assert cache.get("25") == "pikachu"
+
+    clock.now += 5
+    assert cache.lookup("25") == ("pikachu", EXPIRED)
+    assert cache.get("25") is None
+    assert "25" not in cache
+
+    clock.now += 19
+    assert cache.lookup("25") == ("pikachu", EXPIRED)
+
+
+def test_dropped_past_the_grace():
+
+    clock = Clock()
+    cache = TTLCache(maxsize = 4, ttl = 10, grace = 20, clock = clock)
+    cache.set("25", "pikachu")
+
+    clock.now += 30
+    assert cache.lookup("25") == (None, None)
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_soft_ttl_defaults_to_the_ttl():
+
+    clock = Clock()
+    cache = TTLCache(maxsize = 4, ttl = 10, clock = clock)
+    cache.set("25", "pikachu")
+
+    clock.now += 9.9
+    assert cache.lookup("25") == ("pikachu", FRESH)
+
+    clock.now += 0.1
+    assert cache.lookup("25") == (None, None)
+
+
+def test_set_again_makes_it_fresh():
+
+    clock = Clock()
+    cache = TTLCache(maxsize = 4, ttl = 10, soft_ttl = 5, grace = 20, clock = clock)
+    cache.set("25", "pikachu")
+
+    clock.now += 12
+    cache.set("25", "raichu")
+
+    assert cache.lookup("25") == ("raichu", FRESH)
+
+
+def test_least_recently_used_is_evicted():
+
+    cache = TTLCache(maxsize = 2, ttl = 10, clock = Clock())
+    cache.set("1", "bulbasaur")
+    cache.set("2", "ivysaur")
+
+    # Makes "2" the least recently used
+    cache.get("1")
+    cache.set("3", "venusaur")
+
+    assert cache.get("1") == "bulbasaur"
+    assert cache.get("2") is None
+    assert cache.get("3") == "venusaur"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disabled_when_maxsize_is_zero():
+
+    cache = TTLCache(maxsize = 0, clock = Clock())
+    cache.set("25", "pikachu")
+
+    assert cache.lookup("25") == (None, None)
@@ -0,0 +1,131 @@
+## -- Importing External Modules -- ##
+import pytest
+
+## -- Importing Internal Modules -- ##
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def open_breaker(clock: Clock) -> CircuitBreaker:
+
+    breaker = CircuitBreaker(failures = 3, reset_timeout = 30, clock = clock)
+
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+
+    breaker = CircuitBreaker(failures = 3, reset_timeout = 30, clock = Clock())
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+
+    # A success in between starts the count again
+    breaker.before_call()
+    breaker.record_success()
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.opened == 1
+
+
+def test_refuses_calls_while_open():
+
+    clock = Clock()
+    breaker = open_breaker(clock)
+
+    clock.now += 10
+
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+
+    assert error.value.retry_after == pytest.approx(20)
+    assert breaker.rejected == 1
+
+
+def test_half_open_lets_a_single_probe_through():
+
+    clock = Clock()
+    breaker = open_breaker(clock)
+
+    clock.now += 30
+    breaker.before_call()
+
+    assert breaker.state == HALF_OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_probe_success_closes():
+
+    clock = Clock()
+    breaker = open_breaker(clock)
+
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+
+    breaker.before_call()
+    breaker.before_call()
+
+
+def test_probe_failure_opens_again():
+
+    clock = Clock()
+    breaker = open_breaker(clock)
+
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+
+    # For another whole reset timeout
+    clock.now += 29
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now += 1
+    breaker.before_call()
+
+    assert breaker.state == HALF_OPEN
+
+
+def test_released_probe_lets_another_one_through():
+
+    clock = Clock()
+    breaker = open_breaker(clock)
+
+    clock.now += 30
+    breaker.before_call()
+
+    # The probe was cancelled, without a result
+    breaker.release()
+    breaker.before_call()
+
+    assert breaker.state == HALF_OPEN
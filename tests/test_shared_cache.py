@@ -0,0 +1,133 @@
+## -- Importing External Modules -- ##
+import pytest
+
+## -- Importing Internal Modules -- ##
+from app.services import shared_cache
+from app.services.shared_cache import SharedCache
+
+pytestmark = pytest.mark.skipif(shared_cache.fcntl is None, reason = "needs file locks (fcntl)")
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "shared")
+
+
+def opened(path: str, **kwargs) -> SharedCache:
+
+    cache = SharedCache(path, **kwargs)
+    cache.open()
+
+    return cache
+
+
+def test_set_then_get(path):
+
+    cache = opened(path, size = 64 * 1024, slots = 16)
+    cache.set("25", b'{"name":"pikachu"}')
+
+    assert cache.get("25") == b'{"name":"pikachu"}'
+    assert cache.get("26") is None
+
+    cache.close()
+
+
+def test_shared_between_instances(path):
+
+    writer = opened(path, size = 64 * 1024, slots = 16)
+    reader = opened(path, size = 64 * 1024, slots = 16)
+
+    writer.set("25", b"pikachu")
+
+    assert reader.get("25") == b"pikachu"
+
+    writer.close()
+    reader.close()
+
+
+def test_set_again_replaces(path):
+
+    cache = opened(path, size = 64 * 1024, slots = 16)
+    cache.set("25", b"old")
+    cache.set("25", b"new")
+
+    assert cache.get("25") == b"new"
+
+    cache.close()
+
+
+def test_ring_wraps_around_overwriting_the_oldest(path):
+
+    cache = opened(path, size = 16 * 1024, slots = 64)
+    # Keys of the same length, so every record takes the same room
+    keys = [str(id) for id in range(10, 30)]
+    bodies = {key: bytes(range(256)) * 4 + key.encode() for key in keys}
+
+    for key, body in bodies.items():
+        cache.set(key, body)
+
+    # Records of the first pass that fit before the ring wrapped, the
+    # ones after it were written over the start of the arena again
+    fits = cache.arena_size // (2 + 2 + len(bodies["10"]))
+    overwritten = len(keys) - fits
+
+    assert 0 < overwritten < fits
+
+    for key in keys[:overwritten]:
+        assert cache.get(key) is None
+
+    for key in keys[overwritten:]:
+        assert cache.get(key) == bodies[key]
+
+    cache.close()
+
+
+def test_corrupted_record_is_a_miss(path):
+
+    cache = opened(path, size = 64 * 1024, slots = 16)
+    cache.set("25", b"pikachu")
+
+    # Like a writer overwriting the record while it is read
+    start = cache.arena_start + 2 + len(b"25")
+    cache._map[start:start + 1] = b"P"
+
+    assert cache.get("25") is None
+
+    cache.close()
+
+
+def test_expired_or_too_old_is_a_miss(path):
+
+    cache = opened(path, size = 64 * 1024, slots = 16, ttl = 300)
+    cache.set("25", b"pikachu")
+
+    assert cache.get("25", max_age = 60) == b"pikachu"
+    assert cache.get("25", max_age = 0) is None
+
+    cache.ttl = 0
+    assert cache.get("25") is None
+
+    cache.close()
+
+
+def test_layout_change_resets_the_file(path):
+
+    cache = opened(path, size = 64 * 1024, slots = 16)
+    cache.set("25", b"pikachu")
+    cache.close()
+
+    cache = opened(path, size = 64 * 1024, slots = 32)
+
+    assert cache.get("25") is None
+
+    cache.close()
+
+
+def test_too_large_is_not_stored(path):
+
+    cache = opened(path, size = 4096, slots = 16)
+    cache.set("25", bytes(8192))
+
+    assert cache.get("25") is None
+
+    cache.close()
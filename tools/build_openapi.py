@@ -0,0 +1,35 @@
+## -- Importing External Modules -- ##
+from pathlib import Path
+import argparse, os, sys
+
+## -- Importing Internal Modules -- ##
+from app.routing import app
+from app.services.openapi import render
+
+description = """
+Pre-generate the OpenAPI document of the api (at build time), so the
+workers serve it from TD_OPENAPI_PATH instead of generating it on their
+first /docs request.
+"""
+
+def main(argv: list = None) -> int:
+
+    parser = argparse.ArgumentParser(description = description)
+    parser.add_argument("output", type = Path, help = "Path of the openapi.json file to be created")
+    args = parser.parse_args(argv)
+
+    body = render(app)
+
+    # Written aside and moved, a running worker never reads half a file
+    temporary = args.output.with_name(args.output.name + ".tmp")
+    temporary.parent.mkdir(parents = True, exist_ok = True)
+    temporary.write_bytes(body)
+    os.replace(temporary, args.output)
+
+    print(f"Wrote the OpenAPI document ({len(body) / 1024:.1f} KiB) to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
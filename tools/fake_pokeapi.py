@@ -0,0 +1,340 @@
+## -- Importing External Modules -- ##
+from aiohttp import web
+from pathlib import Path
+import argparse, asyncio, json, math, random, re, sys
+
+## -- Importing Internal Modules -- ##
+from app.interfaces.pokemon_interface import pokemon_example
+from tools.ingest_snapshot import read_dump
+
+description = """
+Local stand-in of the PokeAPI, serving pokemon payloads on the paths the api
+calls, so it can be tested and measured without the public internet. Point
+TD_UPSTREAM_URL to it (http://127.0.0.1:8080 by default).
+
+The payloads come from a folder of json fixtures (like the dumps taken by
+tools.ingest_snapshot) and/or are synthetic ("pokemon-<id>"). Latency,
+errors, 404s and slow bodies can be injected, from a seeded random
+generator so runs are repeatable.
+"""
+
+# Synthetic pokemon are named "pokemon-<id>"
+SYNTHETIC_NAME = re.compile(r"^pokemon-(\d+)$")
+
+# Bytes written at a time on slow bodies
+CHUNK_SIZE = 4096
+
+
+def synthetic_payload(id: int, name: str, moves: int) -> bytes:
+    """
+    Upstream-like payload: the documented example renamed to id/name plus
+    "moves" moves, the part that makes the real payloads large
+    """
+
+    data = json.loads(json.dumps(pokemon_example()))
+
+    data["id"] = id
+    data["name"] = name
+    data["species"] = {"name": name, "url": f"https://pokeapi.co/api/v2/pokemon-species/{id}/"}
+
+    data["moves"] = [
+        {
+            "move": {"name": f"move-{index}", "url": f"https://pokeapi.co/api/v2/move/{index}/"},
+            "version_group_details": [
+                {
+                    "level_learned_at": index % 100,
+                    "move_learn_method": {"name": "level-up", "url": "https://pokeapi.co/api/v2/move-learn-method/1/"},
+                    "version_group": {"name": f"group-{group}", "url": f"https://pokeapi.co/api/v2/version-group/{group}/"},
+                }
+                for group in range(8)
+            ],
+        }
+        for index in range(moves)
+    ]
+
+    return json.dumps(data, separators = (",", ":")).encode()
+
+
+def latency_sampler(spec: str, rng: random.Random):
+    """
+    Function returning a latency in seconds from a "<distribution>:<ms,...>"
+    spec: "constant:20" (or just "20"), "uniform:10,50", "normal:20,5"
+    (mean, deviation), "lognormal:20,0.5" (median, sigma) or "exponential:20"
+    (mean). Negative samples become 0
+    """
+
+    kind, _, values = spec.partition(":") if ":" in spec else ("constant", "", spec)
+
+    try:
+        values = [float(value) for value in values.split(",")]
+
+    except ValueError:
+        raise ValueError(f"Latency {spec!r} has non numeric values") from None
+
+    samplers = {
+        "constant": (1, lambda value: value),
+        "uniform": (2, rng.uniform),
+        "normal": (2, rng.gauss),
+        "lognormal": (2, lambda median, sigma: rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0),
+        "exponential": (1, lambda mean: rng.expovariate(1 / mean) if mean > 0 else 0.0),
+    }
+
+    if kind not in samplers:
+        raise ValueError(f"Latency distribution {kind!r} is not one of {', '.join(samplers)}")
+
+    arity, sample = samplers[kind]
+
+    if len(values) != arity:
+        raise ValueError(f"Latency distribution {kind!r} takes {arity} value(s)")
+
+    return lambda: max(0.0, sample(*values)) / 1000
+
+
+class FakePokeApi:
+    """
+    Serves the fixtures plus "count" synthetic pokemon, found by id or by
+    name; anything else is a 404, like on the PokeAPI.
+
+    Every answer waits a "latency" sample, then fails with one of the
+    "error_statuses" at "error_rate", is a 404 at "not_found_rate" or has
+    its body streamed over "slow_body" seconds at "slow_body_rate".
+    """
+
+    def __init__(
+        self,
+        fixtures: dict = None,
+        count: int = 1010,
+        moves: int = 100,
+        latency: str = "0",
+        error_rate: float = 0.0,
+        error_statuses: tuple = (503,),
+        not_found_rate: float = 0.0,
+        slow_body_rate: float = 0.0,
+        slow_body: float = 1.0,
+        seed: int = None,
+    ):
+
+        self.fixtures = fixtures or {}
+        self.count = count
+        self.moves = moves
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.not_found_rate = not_found_rate
+        self.slow_body_rate = slow_body_rate
+        self.slow_body = slow_body
+
+        self.rng = random.Random(seed)
+        self.latency = latency_sampler(latency, self.rng)
+
+        # Fixtures are found by id and by name
+        self.names = {name: id for id, (name, _) in self.fixtures.items()}
+        self.payloads = {}
+
+        self.served = {"ok": 0, "not_found": 0, "error": 0, "slow": 0}
+
+    @classmethod
+    def from_folder(cls, folder: Path, **kwargs) -> "FakePokeApi":
+
+        skipped = []
+        fixtures = {id: (name, body) for id, name, body in read_dump(folder, skipped)}
+
+        for path in skipped:
+            print(f"Skipped {path}: not a pokemon payload", file = sys.stderr)
+
+        return cls(fixtures, **kwargs)
+
+    def resolve(self, key: str) -> int:
+        """
+        Id of the pokemon with the key (id or name), None if there is none
+        """
+
+        key = key.lower()
+
+        if key in self.names:
+            return self.names[key]
+
+        match = SYNTHETIC_NAME.match(key)
+
+        if match:
+            key = match.group(1)
+
+        if not key.isdecimal():
+            return None
+
+        id = int(key)
+
+        if id in self.fixtures or 1 <= id <= self.count:
+            return id
+
+        return None
+
+    def payload(self, id: int) -> bytes:
+
+        if id in self.fixtures:
+            return self.fixtures[id][1]
+
+        body = self.payloads.get(id)
+
+        if body is None:
+            body = self.payloads[id] = synthetic_payload(id, f"pokemon-{id}", self.moves)
+
+        return body
+
+    async def listing(self, request: web.Request) -> web.Response:
+        """
+        Paginated list of every pokemon served, like /api/v2/pokemon/ and
+        /api/v2/pokemon-species/
+        """
+
+        try:
+            limit = int(request.query.get("limit", 20))
+            offset = int(request.query.get("offset", 0))
+
+        except ValueError:
+            return web.Response(status = 400, text = "Bad Request")
+
+        # Synthetic ids 1 to count, then the fixtures past them
+        extra = sorted(id for id in self.fixtures if not 1 <= id <= self.count)
+        total = self.count + len(extra)
+        page = [
+            index + 1 if index < self.count else extra[index - self.count]
+            for index in range(max(0, offset), min(total, offset + limit))
+        ]
+
+        url = f"{request.url.origin()}{request.path}"
+        path = request.path.rstrip("/")
+
+        results = [
+            {
+                "name": self.fixtures[id][0] if id in self.fixtures else f"pokemon-{id}",
+                "url": f"https://pokeapi.co{path}/{id}/",
+            }
+            for id in page
+        ]
+
+        return web.json_response({
+            "count": total,
+            "next": f"{url}?offset={offset + limit}&limit={limit}" if offset + limit < total else None,
+            "previous": f"{url}?offset={max(0, offset - limit)}&limit={limit}" if offset > 0 else None,
+            "results": results,
+        })
+
+    async def pokemon(self, request: web.Request) -> web.StreamResponse:
+
+        delay = self.latency()
+
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.rng.random() < self.error_rate:
+            self.served["error"] += 1
+            return web.Response(status = self.rng.choice(self.error_statuses))
+
+        id = self.resolve(request.match_info["key"])
+
+        if id is None or self.rng.random() < self.not_found_rate:
+            self.served["not_found"] += 1
+            return web.Response(status = 404, text = "Not Found")
+
+        body = self.payload(id)
+
+        if self.rng.random() >= self.slow_body_rate:
+            self.served["ok"] += 1
+            return web.Response(body = body, content_type = "application/json")
+
+        # Headers right away, then the body a chunk at a time over "slow_body"
+        # seconds, exercising the read timeouts of the client
+        self.served["slow"] += 1
+
+        response = web.StreamResponse(headers = {"Content-Type": "application/json"})
+        response.content_length = len(body)
+        await response.prepare(request)
+
+        chunks = range(0, len(body), CHUNK_SIZE)
+
+        for start in chunks:
+            await asyncio.sleep(self.slow_body / len(chunks))
+            await response.write(body[start:start + CHUNK_SIZE])
+
+        await response.write_eof()
+        return response
+
+    async def stats(self, request: web.Request) -> web.Response:
+        """
+        Answers given so far, to check what reached the "upstream"
+        """
+
+        return web.json_response(self.served)
+
+    def application(self) -> web.Application:
+
+        app = web.Application()
+        app.router.add_get("/api/v2/pokemon/{key}", self.pokemon)
+        app.router.add_get("/api/v2/pokemon/{key}/", self.pokemon)
+        app.router.add_get("/api/v2/pokemon/", self.listing)
+        app.router.add_get("/api/v2/pokemon", self.listing)
+        app.router.add_get("/api/v2/pokemon-species/", self.listing)
+        app.router.add_get("/api/v2/pokemon-species", self.listing)
+        app.router.add_get("/_fake/stats", self.stats)
+
+        return app
+
+
+def rate(value: str) -> float:
+
+    value = float(value)
+
+    if not 0 <= value <= 1:
+        raise argparse.ArgumentTypeError(f"{value} is not between 0 and 1")
+
+    return value
+
+
+def main(argv: list = None) -> int:
+
+    parser = argparse.ArgumentParser(description = description)
+    parser.add_argument("--host", default = "127.0.0.1", help = "Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type = int, default = 8080, help = "Port to bind (default: 8080)")
+    parser.add_argument("--fixtures", type = Path, help = "Folder with pokemon json files to serve")
+    parser.add_argument("--count", type = int, help = "Synthetic pokemon served, ids 1 to count (default: 1010, 0 with --fixtures)")
+    parser.add_argument("--moves", type = int, default = 100, help = "Moves on each synthetic payload (default: 100)")
+    parser.add_argument("--latency", default = "0", help = "Latency in ms before each answer: \"20\", \"uniform:10,50\", \"normal:20,5\", \"lognormal:20,0.5\" or \"exponential:20\" (default: 0)")
+    parser.add_argument("--error-rate", type = rate, default = 0.0, help = "Share of answers that are errors (default: 0)")
+    parser.add_argument("--error-status", type = int, action = "append", help = "Status of the errors, can be repeated (default: 503)")
+    parser.add_argument("--not-found-rate", type = rate, default = 0.0, help = "Share of known pokemon answered with a 404 (default: 0)")
+    parser.add_argument("--slow-body-rate", type = rate, default = 0.0, help = "Share of answers with a slowly streamed body (default: 0)")
+    parser.add_argument("--slow-body-ms", type = float, default = 1000, help = "Time taken to stream a slow body (default: 1000)")
+    parser.add_argument("--seed", type = int, help = "Seed of the injected faults and latencies, for repeatable runs")
+    args = parser.parse_args(argv)
+
+    if args.fixtures is not None and not args.fixtures.is_dir():
+        parser.error(f"{args.fixtures} is not a directory")
+
+    if args.count is None:
+        args.count = 0 if args.fixtures else 1010
+
+    options = {
+        "count": args.count,
+        "moves": args.moves,
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "error_statuses": tuple(args.error_status or (503,)),
+        "not_found_rate": args.not_found_rate,
+        "slow_body_rate": args.slow_body_rate,
+        "slow_body": args.slow_body_ms / 1000,
+        "seed": args.seed,
+    }
+
+    try:
+        fake = FakePokeApi.from_folder(args.fixtures, **options) if args.fixtures else FakePokeApi(**options)
+
+    except ValueError as error:
+        parser.error(str(error))
+
+    web.run_app(fake.application(), host = args.host, port = args.port, print = None, access_log = None)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+## -- Importing External Modules -- ##
+from pathlib import Path
+import argparse, json, sys
+
+## -- Importing Internal Modules -- ##
+from app.services.store import SnapshotStore
+
+description = """
+Ingest a local dump of the PokeAPI (a directory with one "/api/v2/pokemon/"
+JSON payload per file, at any depth) into a snapshot that the api can serve
+from with TD_SNAPSHOT_PATH.
+"""
+
+def read_dump(folder: Path, skipped: list):
+    """
+    Yield (id, name, compact payload) of every pokemon json file under folder
+    """
+
+    for path in sorted(folder.rglob("*.json")):
+
+        try:
+            data = json.loads(path.read_bytes())
+
+        except (OSError, ValueError):
+            skipped.append(path)
+            continue
+
+        if not (isinstance(data, dict) and isinstance(data.get("id"), int) and data.get("name")):
+            skipped.append(path)
+            continue
+
+        body = json.dumps(data, separators = (",", ":"), ensure_ascii = False)
+        yield data["id"], data["name"].lower(), body.encode()
+
+
+def main(argv: list = None) -> int:
+
+    parser = argparse.ArgumentParser(description = description)
+    parser.add_argument("dump", type = Path, help = "Folder with the pokemon json files")
+    parser.add_argument("output", help = "Path of the snapshot file to be created")
+    args = parser.parse_args(argv)
+
+    if not args.dump.is_dir():
+        parser.error(f"{args.dump} is not a directory")
+
+    skipped = []
+    count = SnapshotStore.create(args.output, read_dump(args.dump, skipped))
+
+    print(f"Ingested {count} pokemon into {args.output}")
+
+    for path in skipped:
+        print(f"Skipped {path}: not a pokemon payload", file = sys.stderr)
+
+    return 0 if count else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())